@@ -5,12 +5,13 @@ Depending on YAML Options, the following objective types can be included:
 - Completing specific difficulties on specific maps
 - Beating specific tiers of specific boss bloons on specific maps
 - Beating specific tiers of specific elite boss bloons on specific maps
+- Completing every included mode of a difficulty on one map, or one mode on several maps of a map type
 """
 
 from __future__ import annotations
 
 import functools
-from typing import List, Dict, Set
+from typing import Callable, List, Dict, Optional, Set, Tuple
 
 from dataclasses import dataclass
 
@@ -34,6 +35,25 @@ class BloonsTD6ArchipelagoOptions:
     bloons_td_6_include_hard_modes: BloonsTD6IncludeHardModes
     bloons_td_6_hard_modes_selection: BloonsTD6HardModesSelection
     bloons_td_6_include_boss_bloon_challenges: BloonsTD6IncludeBossBloonChallenges
+    bloons_td_6_include_medal_sets: BloonsTD6IncludeMedalSets
+
+# Every list the objectives draw from, by name. Each one is built the first time it's asked for and reused after that.
+catalogs: Dict[str, Callable[[], List[str]]] = dict()
+
+# Lists to use instead of the ones written here, by catalog name.
+# Hosts that run for a long time can swap this out to pick up new maps or races without restarting.
+catalog_overrides: Dict[str, List[str]] = dict()
+
+def catalog(function: Callable[[], List[str]]) -> Callable[[], List[str]]:
+    cached: Callable[[], List[str]] = functools.lru_cache(maxsize=None)(function)
+
+    @functools.wraps(function)
+    def lookup() -> List[str]:
+        override: Optional[List[str]] = catalog_overrides.get(function.__name__)
+        return cached() if override is None else override
+
+    catalogs[function.__name__] = lookup
+    return lookup
 
 class BloonsTD6Game(Game):
     """
@@ -73,6 +93,30 @@ class BloonsTD6Game(Game):
             ),
         ]
     
+    # Objectives that can't be done under an optional constraint, as (constraint, objective label, placeholder values).
+    # No objective label means any objective, and None for the values of a placeholder means any of its values.
+    def constraint_conflicts(self) -> List[Tuple[str, Optional[str], Dict[str, Optional[List[str]]]]]:
+        conflicts: List[Tuple[str, Optional[str], Dict[str, Optional[List[str]]]]] = [
+            ("Cannot use Tier 5 Upgrades", None, {"HARDERTIER": ["Tier 5"]}),
+            ("Cannot use Tier 5 Upgrades", None, {"TIER": ["Tier 5"]}),
+            ("Cannot use Tier 5 Upgrades", "Complete EXPERTMAP on HARDMODE", {"HARDMODE": ["CHIMPS"]}),
+            (
+                "Cannot use Tier 5 Upgrades",
+                "Complete HARDMODE on MEDALCOUNT different MAPTYPE maps",
+                {"HARDMODE": ["CHIMPS"], "MAPTYPE": ["Expert"]},
+            ),
+        ]
+        
+        # The Hard medal set only needs CHIMPS when CHIMPS is one of the included Hard modes
+        if "CHIMPS" in self.included_hard_modes():
+            conflicts.append((
+                "Cannot use Tier 5 Upgrades",
+                self.medal_set_label(self.included_hard_modes()),
+                {"MAP": self.expert_maps()},
+            ))
+        
+        return conflicts
+    
     def game_objective_templates(self) -> List[GameObjectiveTemplate]:
         objectives: List[GameObjectiveTemplate] = list()
         
@@ -349,7 +393,7 @@ class BloonsTD6Game(Game):
                     ),
                     
                     GameObjectiveTemplate(
-                        label="Beat TIER Elite BOSS on ADVANCEDMAP",
+                        label="Beat TIER Elite BOSS on EXPERTMAP",
                         data={
                             "TIER": (self.tiers, 1),
                             "BOSS": (self.bosses, 1),
@@ -360,14 +404,180 @@ class BloonsTD6Game(Game):
                         weight=1,
                     ),
                 ])
+        
+        if self.include_medal_sets:
+            # Sets of a single mode would just be the objectives above
+            easier_modes: List[str] = self.included_easier_modes()
+            hard_modes: List[str] = self.included_hard_modes() if self.include_hard_modes else list()
+            
+            # Medium modes on Advanced and Expert maps are difficult, like the single map objectives above
+            has_medium_modes: bool = self.include_medium_modes and bool(self.included_medium_modes())
+            
+            if len(easier_modes) > 1:
+                if self.included_lower_tier_maps():
+                    objectives.append(
+                        GameObjectiveTemplate(
+                            label=self.medal_set_label(easier_modes),
+                            data={
+                                "MAP": (self.included_lower_tier_maps, 1),
+                            },
+                            is_time_consuming=True,
+                            is_difficult=False,
+                            weight=1,
+                        ),
+                    )
+                
+                if self.included_upper_tier_maps():
+                    objectives.append(
+                        GameObjectiveTemplate(
+                            label=self.medal_set_label(easier_modes),
+                            data={
+                                "MAP": (self.included_upper_tier_maps, 1),
+                            },
+                            is_time_consuming=True,
+                            is_difficult=has_medium_modes,
+                            weight=1,
+                        ),
+                    )
+            
+            if len(hard_modes) > 1:
+                objectives.append(
+                    GameObjectiveTemplate(
+                        label=self.medal_set_label(hard_modes),
+                        data={
+                            "MAP": (self.included_maps, 1),
+                        },
+                        is_time_consuming=True,
+                        is_difficult=True,
+                        weight=1,
+                    ),
+                )
+            
+            if easier_modes:
+                if self.included_lower_tier_map_types():
+                    objectives.append(
+                        GameObjectiveTemplate(
+                            label="Complete MODE on MEDALCOUNT different MAPTYPE maps",
+                            data={
+                                "MODE": (self.included_easier_modes, 1),
+                                "MEDALCOUNT": (self.medal_counts, 1),
+                                "MAPTYPE": (self.included_lower_tier_map_types, 1),
+                            },
+                            is_time_consuming=True,
+                            is_difficult=False,
+                            weight=1,
+                        ),
+                    )
+                
+                if self.included_upper_tier_map_types():
+                    objectives.append(
+                        GameObjectiveTemplate(
+                            label="Complete MODE on MEDALCOUNT different MAPTYPE maps",
+                            data={
+                                "MODE": (self.included_easier_modes, 1),
+                                "MEDALCOUNT": (self.medal_counts, 1),
+                                "MAPTYPE": (self.included_upper_tier_map_types, 1),
+                            },
+                            is_time_consuming=True,
+                            is_difficult=has_medium_modes,
+                            weight=1,
+                        ),
+                    )
+            
+            if hard_modes:
+                objectives.append(
+                    GameObjectiveTemplate(
+                        label="Complete HARDMODE on MEDALCOUNT different MAPTYPE maps",
+                        data={
+                            "HARDMODE": (self.included_hard_modes, 1),
+                            "MEDALCOUNT": (self.medal_counts, 1),
+                            "MAPTYPE": (self.included_map_types, 1),
+                        },
+                        is_time_consuming=True,
+                        is_difficult=True,
+                        weight=1,
+                    ),
+                )
             
         return objectives
 
+    # Problems with the chosen options that would stop objectives from generating, as (level, message) pairs
+    def option_problems(self) -> List[Tuple[str, str]]:
+        problems: List[Tuple[str, str]] = list()
+
+        if not any([
+            self.include_beginner_maps,
+            self.include_intermediate_maps,
+            self.include_advanced_maps,
+            self.include_expert_maps,
+        ]):
+            problems.append(("error", "No map types are included, so there are no maps to set objectives on."))
+
+        modes: List[Tuple[str, bool, List[str]]] = [
+            ("easy", self.include_easy_modes, self.included_easy_modes()),
+            ("medium", self.include_medium_modes, self.included_medium_modes()),
+            ("hard", self.include_hard_modes, self.included_hard_modes()),
+        ]
+
+        for difficulty, include, selection in modes:
+            if include and not selection:
+                problems.append((
+                    "error",
+                    f"{difficulty.capitalize()} modes are included, but bloons_td_6_{difficulty}_modes_selection is empty.",
+                ))
+
+        if not any(include for _, include, _ in modes) and not self.include_boss_bloons:
+            problems.append(("error", "No difficulty modes or Boss Bloon Challenges are included."))
+        elif self.include_medal_sets and not any(include and selection for _, include, selection in modes):
+            problems.append((
+                "warning",
+                "Medal sets are included, but there are no difficulty modes to make them from.",
+            ))
+
+        return problems
+
+    # (map type, whether it's included, its maps) for every map type
+    def map_types(self) -> List[Tuple[str, bool, List[str]]]:
+        return [
+            ("Beginner", self.include_beginner_maps, self.beginner_maps()),
+            ("Intermediate", self.include_intermediate_maps, self.intermediate_maps()),
+            ("Advanced", self.include_advanced_maps, self.advanced_maps()),
+            ("Expert", self.include_expert_maps, self.expert_maps()),
+        ]
+    
+    def included_map_types(self) -> List[str]:
+        return [map_type for map_type, include, _ in self.map_types() if include]
+    
+    def included_maps(self) -> List[str]:
+        maps: List[str] = list()
+        
+        for _, include, map_type_maps in self.map_types():
+            if include:
+                maps.extend(map_type_maps)
+        
+        return maps
+    
+    # Beginner and Intermediate, and Advanced and Expert, for objectives that are only difficult on the latter
+    def included_lower_tier_map_types(self) -> List[str]:
+        return [map_type for map_type in self.included_map_types() if map_type in ("Beginner", "Intermediate")]
+    
+    def included_upper_tier_map_types(self) -> List[str]:
+        return [map_type for map_type in self.included_map_types() if map_type in ("Advanced", "Expert")]
+    
+    def included_lower_tier_maps(self) -> List[str]:
+        map_types: List[str] = self.included_lower_tier_map_types()
+        return [map_name for map_type, _, maps in self.map_types() if map_type in map_types for map_name in maps]
+    
+    def included_upper_tier_maps(self) -> List[str]:
+        map_types: List[str] = self.included_upper_tier_map_types()
+        return [map_name for map_type, _, maps in self.map_types() if map_type in map_types for map_name in maps]
+
     @property
     def include_beginner_maps(self) -> bool:
         return bool(self.archipelago_options.bloons_td_6_include_beginner_maps.value)
 
     @staticmethod
+    @catalog
     def beginner_maps() -> List[str]:
         return [
             "Monkey Meadow",
@@ -406,6 +616,7 @@ class BloonsTD6Game(Game):
         return bool(self.archipelago_options.bloons_td_6_include_intermediate_maps.value)
 
     @staticmethod
+    @catalog
     def intermediate_maps() -> List[str]:
         return [
             "Lost Crevasse",
@@ -424,7 +635,7 @@ class BloonsTD6Game(Game):
             
             "Adora's Temple",
             "Spring Spring",
-            "KartsNDarts"
+            "KartsNDarts",
             "Moon Landing",
             "Haunted",
             "Downstream",
@@ -442,6 +653,7 @@ class BloonsTD6Game(Game):
         return bool(self.archipelago_options.bloons_td_6_include_advanced_maps.value)
 
     @staticmethod
+    @catalog
     def advanced_maps() -> List[str]:
         return [
             "Sunset Gulch",
@@ -475,6 +687,7 @@ class BloonsTD6Game(Game):
         return bool(self.archipelago_options.bloons_td_6_include_expert_maps.value)
 
     @staticmethod
+    @catalog
     def expert_maps() -> List[str]:
         return [
             "Tricky Tracks",
@@ -499,6 +712,7 @@ class BloonsTD6Game(Game):
         return bool(self.archipelago_options.bloons_td_6_include_easy_modes.value)
 
     @staticmethod
+    @catalog
     def easy_modes() -> List[str]:
         return [
             "Standard Easy",
@@ -514,6 +728,7 @@ class BloonsTD6Game(Game):
         return bool(self.archipelago_options.bloons_td_6_include_medium_modes.value)
     
     @staticmethod
+    @catalog
     def medium_modes() -> List[str]:
         return [
             "Standard Medium",
@@ -530,6 +745,7 @@ class BloonsTD6Game(Game):
         return bool(self.archipelago_options.bloons_td_6_include_hard_modes.value)
     
     @staticmethod
+    @catalog
     def hard_modes() -> List[str]:
         return [
             "Standard Hard",
@@ -543,12 +759,42 @@ class BloonsTD6Game(Game):
     
     def included_hard_modes(self) -> List[str]:
         return sorted(self.archipelago_options.bloons_td_6_hard_modes_selection.value)
+    
+    # The included Easy and Medium modes, for objectives that mix them
+    def included_easier_modes(self) -> List[str]:
+        modes: List[str] = list()
+        
+        if self.include_easy_modes:
+            modes.extend(self.included_easy_modes())
+        
+        if self.include_medium_modes:
+            modes.extend(self.included_medium_modes())
+        
+        return modes
+    
+    @property
+    def include_medal_sets(self) -> bool:
+        return bool(self.archipelago_options.bloons_td_6_include_medal_sets.value)
+    
+    @staticmethod
+    def medal_set_label(modes: List[str]) -> str:
+        return f"Complete MAP on every one of: {', '.join(modes)}"
+    
+    @staticmethod
+    @catalog
+    def medal_counts() -> List[str]:
+        return [
+            "3",
+            "4",
+            "5",
+        ]
 
     @property
     def include_boss_bloons(self) -> bool:
         return bool(self.archipelago_options.bloons_td_6_include_boss_bloon_challenges.value)
     
     @staticmethod
+    @catalog
     def bosses() -> List[str]:
         return [
             "Bloonarius",
@@ -560,6 +806,7 @@ class BloonsTD6Game(Game):
         ]
     
     @staticmethod
+    @catalog
     def easier_tiers() -> List[str]:
         return [
             "Tier 1",
@@ -567,6 +814,7 @@ class BloonsTD6Game(Game):
         ]
     
     @staticmethod
+    @catalog
     def harder_tiers() -> List[str]:
         return [
             "Tier 3",
@@ -575,6 +823,7 @@ class BloonsTD6Game(Game):
         ]
     
     @staticmethod
+    @catalog
     def tiers() -> List[str]:
         return [
             "Tier 1",
@@ -635,7 +884,7 @@ class BloonsTD6EasyModesSelection(OptionSet):
     """
     
     display_name = "Bloons TD 6 Easy Modes Selection"
-    valid_keys = BloonsTD6Game().easy_modes()
+    valid_keys = BloonsTD6Game.easy_modes()
 
     default = valid_keys
 
@@ -654,7 +903,7 @@ class BloonsTD6MediumModesSelection(OptionSet):
     """
     
     display_name = "Bloons TD 6 Medium Modes Selection"
-    valid_keys = BloonsTD6Game().medium_modes()
+    valid_keys = BloonsTD6Game.medium_modes()
 
     default = valid_keys
 
@@ -673,7 +922,7 @@ class BloonsTD6HardModesSelection(OptionSet):
     """
     
     display_name = "Bloons TD 6 Hard Modes Selection"
-    valid_keys = BloonsTD6Game().hard_modes()
+    valid_keys = BloonsTD6Game.hard_modes()
 
     default = valid_keys
     
@@ -683,3 +932,12 @@ class BloonsTD6IncludeBossBloonChallenges(Toggle):
     """
     
     display_name = "Bloons TD 6 Include Boss Bloon Challenges"
+
+class BloonsTD6IncludeMedalSets(Toggle):
+    """
+    Indicates whether to include objectives covering several medals at once when generating Bloons TD 6 objectives.
+    
+    These are completing every included mode of a difficulty on one map, or one mode on several maps of a map type.
+    """
+    
+    display_name = "Bloons TD 6 Include Medal Sets"
@@ -0,0 +1,124 @@
+"""
+Round trips and rejections of tools/binary_keeps.py, for both games.
+
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import struct
+
+from random import Random
+from typing import Any, List, Sequence, Tuple
+
+import pytest
+
+from tools.binary_keeps import HEADER, MAGIC, VERSION, KeepView, encode_keep, encode_objectives
+from tools.combinations import CompiledTemplate
+from tools.compare_generation import feasible_cases
+from tools.implementations import game_classes, load_implementations, make_game
+from tools.streams import generate_objectives
+from tools.weights import weight_table
+
+GAMES: List[str] = ["Bloons TD 6", "Umamusume: Pretty Derby"]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def implementations() -> None:
+    load_implementations(offline=True)
+
+
+def _game(name: str, case: int = 0) -> Any:
+    game_cls: Any = game_classes()[name]
+    options, _ = feasible_cases(game_cls, case + 1, Random(case))[case]
+
+    return make_game(game_cls, options)
+
+
+def _encoded(game: Any) -> bytes:
+    return encode_objectives(weight_table(game).templates, generate_objectives(game, 1234, 40))
+
+
+@pytest.mark.parametrize("name", GAMES)
+@pytest.mark.parametrize("case", range(5))
+def test_round_trip(name: str, case: int) -> None:
+    game: Any = _game(name, case)
+    templates: Sequence[CompiledTemplate] = weight_table(game).templates
+
+    for seed in range(5):
+        objectives: List[str] = generate_objectives(game, seed, 40)
+        view: KeepView = KeepView(encode_objectives(templates, objectives), templates)
+
+        assert len(view) == len(objectives)
+        assert list(view) == objectives
+        assert [view[position] for position in range(len(view))] == objectives
+        assert view[-1] == objectives[-1]
+
+
+@pytest.mark.parametrize("name", GAMES)
+def test_round_trip_from_indices(name: str) -> None:
+    templates: Sequence[CompiledTemplate] = weight_table(_game(name)).templates
+    picks: List[Tuple[int, int]] = [
+        (template_index, template.count - 1) for template_index, template in enumerate(templates)
+    ]
+
+    view: KeepView = KeepView(encode_keep(templates, picks), templates)
+
+    assert [view.entry(position) for position in range(len(view))] == [
+        (template_index, templates[template_index].value_indices(index)) for template_index, index in picks
+    ]
+
+
+def test_empty_keep() -> None:
+    templates: Sequence[CompiledTemplate] = weight_table(_game(GAMES[0])).templates
+
+    assert list(KeepView(encode_keep(templates, []), templates)) == []
+
+
+@pytest.mark.parametrize("name", GAMES)
+def test_rejects_bad_magic(name: str) -> None:
+    game: Any = _game(name)
+    encoded: bytearray = bytearray(_encoded(game))
+    encoded[:len(MAGIC)] = b"JSON"
+
+    with pytest.raises(ValueError, match="Not a binary keep"):
+        KeepView(encoded, weight_table(game).templates)
+
+
+@pytest.mark.parametrize("name", GAMES)
+def test_rejects_other_versions(name: str) -> None:
+    game: Any = _game(name)
+    encoded: bytearray = bytearray(_encoded(game))
+    struct.pack_into("<B", encoded, len(MAGIC), VERSION + 1)
+
+    with pytest.raises(ValueError, match=f"version {VERSION + 1} isn't supported"):
+        KeepView(encoded, weight_table(game).templates)
+
+
+def test_rejects_other_catalogs() -> None:
+    bloons: Any = _game(GAMES[0])
+    umamusume: Any = _game(GAMES[1])
+
+    with pytest.raises(ValueError, match="different templates"):
+        KeepView(_encoded(bloons), weight_table(umamusume).templates)
+
+
+def test_rejects_reordered_templates() -> None:
+    game: Any = _game(GAMES[0])
+    templates: Sequence[CompiledTemplate] = weight_table(game).templates
+
+    # The same number of templates, as an older game file listing them in another order would have
+    with pytest.raises(ValueError, match="different templates"):
+        KeepView(_encoded(game), list(reversed(templates)))
+
+
+def test_rejects_truncated_data() -> None:
+    game: Any = _game(GAMES[0])
+    templates: Sequence[CompiledTemplate] = weight_table(game).templates
+    encoded: bytes = _encoded(game)
+
+    with pytest.raises(ValueError, match="Too short"):
+        KeepView(encoded[:HEADER.size - 1], templates)
+
+    with pytest.raises(ValueError, match="wrong length"):
+        KeepView(encoded[:-1], templates)
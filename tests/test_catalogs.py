@@ -0,0 +1,93 @@
+"""
+Invalidation of tools/catalogs.py caches when an overlay changes a catalog, and the caches built on top of them.
+
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import json
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from tools.catalogs import apply_overlay
+from tools.codex import codex_entries
+from tools.dominance import DominanceLattice, dominance_lattice
+from tools.implementations import game_classes, load_implementations, make_game
+from tools.progress import read_progress
+from tools.streams import generate_objectives
+from tools.weights import weight_table
+
+BLOONS: str = "Bloons TD 6"
+NEW_MAP: str = "Overlay Test Meadow"
+
+
+@pytest.fixture(autouse=True)
+def overlay() -> Iterator[Dict[str, Any]]:
+    modules: Dict[str, Any] = load_implementations(offline=True)
+    beginner_maps: List[str] = list(modules["bloons_td_6"].catalogs["beginner_maps"]())
+
+    yield {BLOONS: {"beginner_maps": beginner_maps + [NEW_MAP]}}
+
+    apply_overlay(dict())
+
+
+def _pools(lattice: DominanceLattice) -> List[str]:
+    return [value for template in lattice.templates for pool in template.pools for value in pool]
+
+
+def test_nested_cache_is_rebuilt(overlay: Dict[str, Any]) -> None:
+    game: Any = make_game(game_classes()[BLOONS], dict())
+
+    # The lattice is built on top of the cached weight table, so it only reads the catalogs through that hit
+    weight_table(game)
+    before: DominanceLattice = dominance_lattice(game)
+
+    assert NEW_MAP not in _pools(before)
+
+    apply_overlay(overlay)
+    after: DominanceLattice = dominance_lattice(game)
+
+    assert after is not before
+    assert NEW_MAP in _pools(after)
+    assert after.templates == weight_table(game).templates
+
+
+def test_known_names_follow_the_overlay(overlay: Dict[str, Any], tmp_path: Path) -> None:
+    path: Path = tmp_path / "progress.json"
+    path.write_text(json.dumps({BLOONS: {"maps": [[NEW_MAP, "CHIMPS"]]}}), encoding="utf-8")
+
+    # Warms the weight table that the known names are then built from
+    codex_entries(game_classes()[BLOONS])
+
+    with pytest.raises(ValueError, match="unknown map"):
+        read_progress(path)
+
+    apply_overlay(overlay)
+
+    assert read_progress(path)[BLOONS]["maps"] == [(NEW_MAP, "CHIMPS")]
+
+
+def test_streams_reject_a_lattice_over_other_pools(overlay: Dict[str, Any]) -> None:
+    game: Any = make_game(game_classes()[BLOONS], dict())
+    lattice: DominanceLattice = dominance_lattice(game)
+
+    apply_overlay(overlay)
+
+    with pytest.raises(ValueError, match="different templates"):
+        generate_objectives(game, 0, 10, lattice=lattice)
+
+    assert len(generate_objectives(game, 0, 10, lattice=dominance_lattice(game))) == 10
+
+
+def test_filtered_lattice_matches_filtered_streams() -> None:
+    game: Any = make_game(game_classes()[BLOONS], dict())
+    lattice: DominanceLattice = dominance_lattice(game, include_difficult=False)
+
+    assert len(generate_objectives(game, 0, 10, lattice=lattice, include_difficult=False)) == 10
+
+    with pytest.raises(ValueError, match="different templates"):
+        generate_objectives(game, 0, 10, lattice=lattice)
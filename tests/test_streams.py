@@ -0,0 +1,66 @@
+"""
+Placeholder draws of tools/streams.py, for pools listing a value more than once.
+
+    python -m pytest tests
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, List, Tuple
+
+import pytest
+
+from tools.combinations import CompiledTemplate
+from tools.implementations import game_classes, load_implementations, make_game
+from tools.streams import ObjectiveStreams, PlaceholderBags
+from tools.weights import weight_table
+
+UMAMUSUME: str = "Umamusume: Pretty Derby"
+TRAINEES: List[str] = ["Gold Ship"] * 9 + ["Vodka"]
+
+
+@pytest.fixture(scope="module")
+def epithet() -> Tuple[Any, int, CompiledTemplate]:
+    load_implementations(offline=True)
+
+    game: Any = make_game(
+        game_classes()[UMAMUSUME],
+        {
+            "umamusume_pretty_derby_trainees_owned": TRAINEES,
+            "umamusume_pretty_derby_include_trainee_challenges": True,
+        },
+    )
+
+    for template_index, template in enumerate(weight_table(game).templates):
+        if template.label == "Get the unique epithet for TRAINEE":
+            return game, template_index, template
+
+    raise AssertionError("No unique epithet template")
+
+
+def test_pools_are_deduplicated(epithet: Tuple[Any, int, CompiledTemplate]) -> None:
+    _, _, template = epithet
+
+    assert template.pools == (("Gold Ship", "Vodka"),)
+    assert template.count == 2
+
+
+def test_streams_keep_duplicate_odds(epithet: Tuple[Any, int, CompiledTemplate]) -> None:
+    game, template_index, template = epithet
+
+    drawn: Counter[str] = Counter(
+        template.render(ObjectiveStreams(seed, game.name).draw(template, template_index)) for seed in range(2000)
+    )
+
+    # 9 in 10, where drawing over the deduplicated pool would give about half
+    assert 0.85 < drawn["Get the unique epithet for Gold Ship"] / 2000 < 0.95
+
+
+def test_bags_deal_duplicates_as_listed(epithet: Tuple[Any, int, CompiledTemplate]) -> None:
+    game, _, template = epithet
+    bags: PlaceholderBags = PlaceholderBags(0, game.name)
+
+    dealt: Counter[str] = Counter(template.render(bags.draw(template)) for _ in range(3 * len(TRAINEES)))
+
+    assert dealt == {"Get the unique epithet for Gold Ship": 27, "Get the unique epithet for Vodka": 3}
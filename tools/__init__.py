@@ -0,0 +1,6 @@
+"""
+Tooling for the Keymaster's Keep implementations in this repository.
+
+Nothing in here is needed to use an implementation; each game file is still meant to be dropped into
+Keymaster's Keep on its own. These modules are for hosts, previews and maintenance of the implementations.
+"""
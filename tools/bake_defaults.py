@@ -0,0 +1,98 @@
+"""
+Pre-bakes the shared state of each game's default options into baked_defaults.py.
+
+    python -m tools.bake_defaults            rewrites tools/baked_defaults.py
+    python -m tools.bake_defaults --check    exits with 1 if it's out of date
+
+Most slots keep the default options, so their templates are written out as frozen data: each distinct pool once,
+and every template as its label, flags and weight with the indices of the pools it draws from. flyweights.py
+uses them instead of building the templates, as long as the game file's hash still matches. Rerun this after
+changing a game file, the same as the manifest.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pprint
+import sys
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .implementations import IMPLEMENTATIONS, load_implementations, make_game, options_fingerprint
+from .manifest import source_hash
+
+BAKED_PATH: Path = Path(__file__).resolve().parent / "baked_defaults.py"
+
+HEADER: str = '''"""
+The shared state of each game's default options, written by python -m tools.bake_defaults. Don't edit by hand.
+"""
+
+'''
+
+
+def _pack(template: Any, pools: Dict[Tuple[str, ...], int]) -> Tuple[Any, ...]:
+    placeholders: List[Tuple[str, int, int]] = list()
+
+    for key, (collection, count) in template.data.items():
+        pool: Tuple[str, ...] = tuple(collection())
+        placeholders.append((key, pools.setdefault(pool, len(pools)), count))
+
+    return template.label, tuple(placeholders), template.is_time_consuming, template.is_difficult, template.weight
+
+
+def bake(module_name: str) -> Dict[str, Any]:
+    module = load_implementations()[module_name]
+    game: Any = make_game(getattr(module, IMPLEMENTATIONS[module_name]), dict())
+
+    pools: Dict[Tuple[str, ...], int] = dict()
+
+    constraints: Tuple[Tuple[Any, ...], ...] = tuple(
+        _pack(template, pools) for template in game.optional_game_constraint_templates()
+    )
+
+    templates: Tuple[Tuple[Any, ...], ...] = tuple(
+        _pack(template, pools) for template in game.game_objective_templates()
+    )
+
+    return {
+        "source_sha256": source_hash(module_name),
+        "fingerprint": options_fingerprint(game),
+        "pools": tuple(pools),
+        "constraints": constraints,
+        "templates": templates,
+    }
+
+
+def render() -> str:
+    baked: Dict[str, Dict[str, Any]] = {module_name: bake(module_name) for module_name in IMPLEMENTATIONS}
+    return f"{HEADER}BAKED = {pprint.pformat(baked, width=120, sort_dicts=False)}\n"
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="only check that the baked data is up to date")
+
+    args = parser.parse_args(arguments)
+
+    # The catalogs of an overlay aren't defaults, so they're never baked in
+    load_implementations(offline=True)
+
+    rendered: str = render()
+
+    if args.check:
+        current: str = BAKED_PATH.read_text(encoding="utf-8") if BAKED_PATH.exists() else ""
+
+        if current != rendered:
+            print(f"{BAKED_PATH.name} is out of date, rerun python -m tools.bake_defaults", file=sys.stderr)
+            return 1
+
+        return 0
+
+    BAKED_PATH.write_text(rendered, encoding="utf-8", newline="\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
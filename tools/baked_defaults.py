@@ -0,0 +1,427 @@
+"""
+The shared state of each game's default options, written by python -m tools.bake_defaults. Don't edit by hand.
+"""
+
+BAKED = {'bloons_td_6': {'source_sha256': 'ac699aa5bf00ef4eb986b629da132db92eec9972a165a955784e03c66dc06c33',
+                 'fingerprint': ('Bloons TD 6',
+                                 ('bloons_td_6_include_beginner_maps', 1),
+                                 ('bloons_td_6_include_intermediate_maps', 1),
+                                 ('bloons_td_6_include_advanced_maps', 1),
+                                 ('bloons_td_6_include_expert_maps', 0),
+                                 ('bloons_td_6_include_easy_modes', 1),
+                                 ('bloons_td_6_easy_modes_selection', ('Deflation', 'Primary Only', 'Standard Easy')),
+                                 ('bloons_td_6_include_medium_modes', 1),
+                                 ('bloons_td_6_medium_modes_selection',
+                                  ('Apopalypse', 'Military Only', 'Reverse', 'Standard Medium')),
+                                 ('bloons_td_6_include_hard_modes', 1),
+                                 ('bloons_td_6_hard_modes_selection',
+                                  ('Alternate Bloons Rounds',
+                                   'CHIMPS',
+                                   'Double HP MOABS',
+                                   'Half Cash',
+                                   'Impoppable',
+                                   'Magic Monkeys Only',
+                                   'Standard Hard')),
+                                 ('bloons_td_6_include_boss_bloon_challenges', 0),
+                                 ('bloons_td_6_include_medal_sets', 0)),
+                 'pools': (('Monkey Meadow',
+                            'In The Loop',
+                            "Three Mines 'Round",
+                            'Spa Pits',
+                            'Tinkerton',
+                            'Tree Stump',
+                            'Town Center',
+                            'Middle Of The Road',
+                            'One Two Tree',
+                            'Scrapyard',
+                            'The Cabin',
+                            'Resort',
+                            'Skates',
+                            'Lotus Island',
+                            'Candy Falls',
+                            'Winter Park',
+                            'Carved',
+                            'Park Path',
+                            'Alpine Run',
+                            'Frozen Over',
+                            'Cubism',
+                            'Four Circles',
+                            'Hedge',
+                            'End Of The Road',
+                            'Logs'),
+                           ('Deflation', 'Primary Only', 'Standard Easy'),
+                           ('Apopalypse', 'Military Only', 'Reverse', 'Standard Medium'),
+                           ('Alternate Bloons Rounds',
+                            'CHIMPS',
+                            'Double HP MOABS',
+                            'Half Cash',
+                            'Impoppable',
+                            'Magic Monkeys Only',
+                            'Standard Hard'),
+                           ('Lost Crevasse',
+                            'Luminous Cove',
+                            'Sulfur Springs',
+                            'Water Park',
+                            'Polyphemus',
+                            'Covered Garden',
+                            'Quarry',
+                            'Quiet Street',
+                            'Bloonarius Prime',
+                            'Balance',
+                            'Encrypted',
+                            'Bazaar',
+                            "Adora's Temple",
+                            'Spring Spring',
+                            'KartsNDarts',
+                            'Moon Landing',
+                            'Haunted',
+                            'Downstream',
+                            'Firing Range',
+                            'Cracked',
+                            'Streambed',
+                            'Chutes',
+                            'Rake',
+                            'Spice Islands'),
+                           ('Sunset Gulch',
+                            'Enchanted Glade',
+                            'Last Resort',
+                            'Ancient Portal',
+                            'Castle Revenge',
+                            'Dark Path',
+                            'Erosion',
+                            'Midnight Mansion',
+                            'Sunken Columns',
+                            'X Factor',
+                            'Mesa',
+                            'Geared',
+                            'Spillway',
+                            'Cargo',
+                            "Pat's Pond",
+                            'Peninsula',
+                            'High Finance',
+                            'Another Brick',
+                            'Off The Coast',
+                            'Cornfield',
+                            'Underground')),
+                 'constraints': (('Cannot use Heroes', (), False, False, 1),
+                                 ('Cannot use Tier 5 Upgrades', (), False, False, 1),
+                                 ('Disable all Monkey Knowledge', (), False, False, 1)),
+                 'templates': (('Complete BEGINNERMAP on EASYMODE',
+                                (('BEGINNERMAP', 0, 1), ('EASYMODE', 1, 1)),
+                                False,
+                                False,
+                                1),
+                               ('Complete BEGINNERMAP on MEDIUMMODE',
+                                (('BEGINNERMAP', 0, 1), ('MEDIUMMODE', 2, 1)),
+                                False,
+                                False,
+                                1),
+                               ('Complete BEGINNERMAP on HARDMODE',
+                                (('BEGINNERMAP', 0, 1), ('HARDMODE', 3, 1)),
+                                False,
+                                False,
+                                1),
+                               ('Complete INTERMEDIATEMAP on EASYMODE',
+                                (('INTERMEDIATEMAP', 4, 1), ('EASYMODE', 1, 1)),
+                                False,
+                                False,
+                                1),
+                               ('Complete INTERMEDIATEMAP on MEDIUMMODE',
+                                (('INTERMEDIATEMAP', 4, 1), ('MEDIUMMODE', 2, 1)),
+                                False,
+                                False,
+                                1),
+                               ('Complete INTERMEDIATEMAP on HARDMODE',
+                                (('INTERMEDIATEMAP', 4, 1), ('HARDMODE', 3, 1)),
+                                False,
+                                True,
+                                1),
+                               ('Complete ADVANCEDMAP on EASYMODE',
+                                (('ADVANCEDMAP', 5, 1), ('EASYMODE', 1, 1)),
+                                False,
+                                False,
+                                1),
+                               ('Complete ADVANCEDMAP on MEDIUMMODE',
+                                (('ADVANCEDMAP', 5, 1), ('MEDIUMMODE', 2, 1)),
+                                False,
+                                True,
+                                1),
+                               ('Complete ADVANCEDMAP on HARDMODE',
+                                (('ADVANCEDMAP', 5, 1), ('HARDMODE', 3, 1)),
+                                False,
+                                True,
+                                1))},
+ 'umamusume_pretty_derby': {'source_sha256': '130b9cc5dd3768e57a213022528b09da4096434d003311ee8ff86edd409ad96b',
+                            'fingerprint': ('Umamusume: Pretty Derby',
+                                            ('umamusume_pretty_derby_trainees_owned',
+                                             ('Agnes Digital',
+                                              'Agnes Tachyon',
+                                              'Air Groove (Normal)',
+                                              'Air Groove (Wedding)',
+                                              'Biwa Hayahide',
+                                              'Curren Chan',
+                                              'Daiwa Scarlet',
+                                              'Eishin Flash',
+                                              'El Condor Pasa (Normal)',
+                                              'El Condor Pasa (Fantasy)',
+                                              'Fuji Kiseki',
+                                              'Gold City',
+                                              'Gold Ship',
+                                              'Grass Wonder (Normal)',
+                                              'Grass Wonder (Fantasy)',
+                                              'Haru Urara',
+                                              'Hishi Akebono',
+                                              'Hishi Amazon',
+                                              'Kawakami Princess',
+                                              'King Halo',
+                                              'Maruzensky (Normal)',
+                                              'Maruzensky (Summer)',
+                                              'Matikanefukukitaru (Normal)',
+                                              'Matikanefukukitaru (Full Armour)',
+                                              'Mayano Top Gun (Normal)',
+                                              'Mayano Top Gun (Wedding)',
+                                              'Meisho Doto',
+                                              'Mejiro McQueen (Normal)',
+                                              'Mejiro McQueen (Anime Collab)',
+                                              'Mejiro Ryan',
+                                              'Mihono Bourbon',
+                                              'Narita Brian',
+                                              'Narita Taishin',
+                                              'Nice Nature',
+                                              'Oguri Cap',
+                                              'Rice Shower (Normal)',
+                                              'Rice Shower (Halloween)',
+                                              'Sakura Bakushin O',
+                                              'Seiun Sky',
+                                              'Silence Suzuka',
+                                              'Smart Falcon',
+                                              'Special Week (Normal)',
+                                              'Special Week (Summer)',
+                                              'Super Creek (Normal)',
+                                              'Super Creek (Halloween)',
+                                              'Symboli Rudolf',
+                                              'Taiki Shuttle',
+                                              'TM Opera O',
+                                              'Tokai Teio (Normal)',
+                                              'Tokai Teio (Anime Collab)',
+                                              'Vodka',
+                                              'Winning Ticket')),
+                                            ('umamusume_pretty_derby_include_trainee_challenges', 1),
+                                            ('umamusume_pretty_derby_include_g1', 1),
+                                            ('umamusume_pretty_derby_include_g2', 1),
+                                            ('umamusume_pretty_derby_include_g3', 1),
+                                            ('umamusume_pretty_derby_include_ura_finale', 0),
+                                            ('umamusume_pretty_derby_include_unity_cup', 0)),
+                            'pools': (('Speed', 'Stamina', 'Power', 'Guts', 'Wit'),
+                                      ('Junior Make Debut',
+                                       'Asahi Hai Futurity Stakes',
+                                       'Hanshin Juvenile Fillies',
+                                       'Hopeful Stakes',
+                                       'Satsuki Sho',
+                                       'NHK Mile Cup',
+                                       'Tokyo Yushun (Japanese Derby)',
+                                       'Yasuda Kinen',
+                                       'Takarazuka Kinen',
+                                       'Japan Dirt Derby',
+                                       'Sprinters Stakes',
+                                       'Kikuka Sho',
+                                       'JBC Classic',
+                                       "JBC Ladies' Classic",
+                                       'JBC Sprint',
+                                       'Queen Elizabeth II Cup',
+                                       'Japan Cup',
+                                       'Mile Championship',
+                                       'Champions Cup',
+                                       'Arima Kinen',
+                                       'Tokyo Daishoten',
+                                       'February Stakes',
+                                       'Tenno Sho (Spring)',
+                                       'Victoria Mile',
+                                       'Teio Sho',
+                                       'Tenno Sho (Autumn)',
+                                       'Daily Hai Junior Stakes',
+                                       'Keio Hai Junior Stakes',
+                                       "Fillies' Revue",
+                                       'Tulip Sho',
+                                       'Yayoi Sho',
+                                       'Spring Stakes',
+                                       'Aoba Sho',
+                                       'Flora Stakes',
+                                       'Kyoto Shimbun Hai',
+                                       'Sapporo Kinen',
+                                       'Centaur Stakes',
+                                       'Rose Stakes',
+                                       'All Comers',
+                                       'Kobe Shimbun Hai',
+                                       'St. Lite Kinen',
+                                       'Fuchu Umamusume Stakes',
+                                       'Kyoto Daishoten',
+                                       'Mainichi Okan',
+                                       'Copa Republica Argentina',
+                                       'Stayers Stakes',
+                                       'Hanshin Cup',
+                                       'Nikkei Shinsun Hai',
+                                       'American JCC',
+                                       'Tokai Stakes',
+                                       'Kyoto Kinen',
+                                       'Nakayama Kinen',
+                                       'Kinko Sho',
+                                       'Nikkei Sho',
+                                       'Hanshin Umamusume Stakes',
+                                       'Keio Hai Spring Cup',
+                                       'Meguro Kinen',
+                                       'Hakodate Junior Stakes',
+                                       'Niigata Junior Stakes',
+                                       'Kokura Junior Stakes',
+                                       'Sapporo Junior Stakes',
+                                       'Saudi Arabia Royal Cup',
+                                       'Artemis Stakes',
+                                       'Fantasy Stakes',
+                                       'Kyoto Junior Stakes',
+                                       'Tokyo Sports Hai Junior Stakes',
+                                       'Fairy Stakes',
+                                       'Keisei Hai',
+                                       'Shinzan Kinen',
+                                       'Kisaragi Sho',
+                                       'Kyodo News Hai',
+                                       'Queen Cup',
+                                       'Falcon Stakes',
+                                       'Flower Cup',
+                                       'Mainichi Hai',
+                                       'Epsom Cup',
+                                       'Mermaid Stakes',
+                                       'Naruo Kinen',
+                                       'Hakodate Sprint Stakes',
+                                       'Unicorn Stakes',
+                                       'CBC Sho',
+                                       'Hakodate Kinen',
+                                       'Procyon Stakes',
+                                       'Radio Nikkei Sho',
+                                       'Tanabata Sho',
+                                       'Chukyo Kinen',
+                                       'Ibis Summer Dash',
+                                       'Queen Stakes',
+                                       'Elm Stakes',
+                                       'Kokura Kinen',
+                                       'Leopard Stakes',
+                                       'Sekiya Kinen',
+                                       'Keeneland Cup',
+                                       'Kitakyushu Kinen',
+                                       'Shion Stakes',
+                                       'Sirius Stakes',
+                                       'Fukushima Kinen',
+                                       'Miyako Stakes',
+                                       'Musashino Stakes',
+                                       'Keihan Hai',
+                                       'Capella Stakes',
+                                       'Challenge Cup',
+                                       'Chunichi Shimbun Hai',
+                                       'Turquoise Stakes',
+                                       'Aichi Hai',
+                                       'Kyoto Kimpai',
+                                       'Nakayama Kimpai',
+                                       'Negishi Stakes',
+                                       'Silk Road Stakes',
+                                       'Tokyo Shimbun Hai',
+                                       'Diamond Stakes',
+                                       'Hankyu Hai',
+                                       'Kokura Daishoten',
+                                       'Kyoto Umamusume Stakes',
+                                       'Nakayama Umamusume Stakes',
+                                       'Ocean Stakes',
+                                       'Antares Stakes',
+                                       'Lord Derby Challenge Trophy',
+                                       'Niigata Daishoten',
+                                       'Heian Stakes',
+                                       'Keisai Hai Autumn Handicap',
+                                       'Niigata Kinen'),
+                                      ('URA Finale', 'Unity Cup'),
+                                      ('Agnes Digital',
+                                       'Agnes Tachyon',
+                                       'Air Groove (Normal)',
+                                       'Air Groove (Wedding)',
+                                       'Biwa Hayahide',
+                                       'Curren Chan',
+                                       'Daiwa Scarlet',
+                                       'Eishin Flash',
+                                       'El Condor Pasa (Fantasy)',
+                                       'El Condor Pasa (Normal)',
+                                       'Fuji Kiseki',
+                                       'Gold City',
+                                       'Gold Ship',
+                                       'Grass Wonder (Fantasy)',
+                                       'Grass Wonder (Normal)',
+                                       'Haru Urara',
+                                       'Hishi Akebono',
+                                       'Hishi Amazon',
+                                       'Kawakami Princess',
+                                       'King Halo',
+                                       'Maruzensky (Normal)',
+                                       'Maruzensky (Summer)',
+                                       'Matikanefukukitaru (Full Armour)',
+                                       'Matikanefukukitaru (Normal)',
+                                       'Mayano Top Gun (Normal)',
+                                       'Mayano Top Gun (Wedding)',
+                                       'Meisho Doto',
+                                       'Mejiro McQueen (Anime Collab)',
+                                       'Mejiro McQueen (Normal)',
+                                       'Mejiro Ryan',
+                                       'Mihono Bourbon',
+                                       'Narita Brian',
+                                       'Narita Taishin',
+                                       'Nice Nature',
+                                       'Oguri Cap',
+                                       'Rice Shower (Halloween)',
+                                       'Rice Shower (Normal)',
+                                       'Sakura Bakushin O',
+                                       'Seiun Sky',
+                                       'Silence Suzuka',
+                                       'Smart Falcon',
+                                       'Special Week (Normal)',
+                                       'Special Week (Summer)',
+                                       'Super Creek (Halloween)',
+                                       'Super Creek (Normal)',
+                                       'Symboli Rudolf',
+                                       'TM Opera O',
+                                       'Taiki Shuttle',
+                                       'Tokai Teio (Anime Collab)',
+                                       'Tokai Teio (Normal)',
+                                       'Vodka',
+                                       'Winning Ticket')),
+                            'constraints': (('Complete these goals whilst only training STAT, if that is possible',
+                                             (('STAT', 0, 1),),
+                                             False,
+                                             False,
+                                             1),
+                                            ('Try to complete these goals in as few Career Runs as is possible',
+                                             (),
+                                             False,
+                                             False,
+                                             1)),
+                            'templates': (('Win 1st in RACE within Career Mode', (('RACE', 1, 1),), False, False, 1),
+                                          ('Get at least 2nd in RACE within Career Mode',
+                                           (('RACE', 1, 1),),
+                                           False,
+                                           False,
+                                           1),
+                                          ('Get at least 3rd in RACE within Career Mode',
+                                           (('RACE', 1, 1),),
+                                           False,
+                                           False,
+                                           1),
+                                          ('Get at least 4th in RACE within Career Mode',
+                                           (('RACE', 1, 1),),
+                                           False,
+                                           False,
+                                           1),
+                                          ('Get at least 5th in RACE within Career Mode',
+                                           (('RACE', 1, 1),),
+                                           False,
+                                           False,
+                                           1),
+                                          ('Get the Good Ending in the SCENARIO scenario with TRAINEE',
+                                           (('SCENARIO', 2, 1), ('TRAINEE', 3, 1)),
+                                           False,
+                                           False,
+                                           1),
+                                          ('Get the unique epithet for TRAINEE', (('TRAINEE', 3, 1),), True, True, 1))}}
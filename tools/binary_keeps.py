@@ -0,0 +1,200 @@
+"""
+A compact binary form of a generated keep, for sending to trackers and clients instead of the objective strings.
+
+    header   magic "KMKK", version, placeholder width, template count, objective count, catalog SHA-256
+    records  one per objective: template id, then the value index of each placeholder, all little-endian uint16
+
+Template ids are positions in the game's weight table (see weights.py) and value indices are positions in each
+placeholder's pool, so a record is 6 or 8 bytes for these games where the string is 30 to 80. The catalog hash
+covers every label and pool of the table, so a client building its table from different options or an older game
+file is told so instead of rendering the wrong objectives.
+
+KeepView decodes straight from the received buffer through a memoryview, and only renders an objective's string
+when it's asked for.
+
+    python -m tools.binary_keeps --cases 200    checks the round trip for random option sets of both games
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import sys
+import time
+
+from random import Random
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .combinations import CompiledTemplate, catalog_hash
+from .compare_generation import feasible_cases
+from .implementations import game_classes, load_implementations, make_game
+from .streams import generate_objectives
+from .weights import weight_table
+
+MAGIC: bytes = b"KMKK"
+VERSION: int = 1
+
+HEADER: struct.Struct = struct.Struct("<4sBBHI32s")
+
+# Padding for the placeholders past a template's own, in tables where templates have different numbers of them
+NO_VALUE: int = 0xFFFF
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def _record(templates: Sequence[CompiledTemplate]) -> Tuple[int, struct.Struct]:
+    width: int = max((len(template.keys) for template in templates), default=0)
+    return width, struct.Struct(f"<{1 + width}H")
+
+
+def encode_keep(templates: Sequence[CompiledTemplate], picks: Iterable[Tuple[int, int]]) -> bytes:
+    """
+    Encodes a keep given as (template index, combination index) pairs over templates.
+
+    Raises ValueError if a table or pool is too big for the format.
+    """
+
+    if len(templates) >= NO_VALUE or any(len(pool) >= NO_VALUE for t in templates for pool in t.pools):
+        raise ValueError(f"Binary keeps only hold up to {NO_VALUE - 1} templates and values per pool")
+
+    width, record = _record(templates)
+
+    buffer: bytearray = bytearray(HEADER.size)
+    count: int = 0
+
+    for template_index, index in picks:
+        value_indices: Tuple[int, ...] = templates[template_index].value_indices(index)
+        buffer += record.pack(template_index, *value_indices, *[NO_VALUE] * (width - len(value_indices)))
+        count += 1
+
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, width, len(templates), count, catalog_hash(templates))
+
+    return bytes(buffer)
+
+
+def encode_objectives(templates: Sequence[CompiledTemplate], objectives: Iterable[str]) -> bytes:
+    """
+    Encodes a keep from its objective strings. Raises ValueError if one doesn't come from any of the templates.
+    """
+
+    def picks() -> Iterator[Tuple[int, int]]:
+        for objective in objectives:
+            for template_index, template in enumerate(templates):
+                index: Optional[int] = template.parse(objective)
+
+                if index is not None:
+                    yield template_index, index
+                    break
+            else:
+                raise ValueError(f"'{objective}' doesn't come from any of the templates")
+
+    return encode_keep(templates, picks())
+
+
+class KeepView:
+    """
+    A read-only sequence over an encoded keep, rendering each objective from the templates when it's accessed.
+
+    Raises ValueError on creation if the data isn't a binary keep, is a version this can't read, or was encoded
+    from different templates.
+    """
+
+    __slots__ = ("templates", "width", "_record", "_view", "_count")
+
+    def __init__(self, data: Buffer, templates: Sequence[CompiledTemplate]) -> None:
+        self.templates: Sequence[CompiledTemplate] = templates
+        self._view: memoryview = memoryview(data)
+
+        if len(self._view) < HEADER.size:
+            raise ValueError("Too short to be a binary keep")
+
+        magic, version, width, template_count, count, catalog = HEADER.unpack_from(self._view)
+
+        if magic != MAGIC:
+            raise ValueError("Not a binary keep")
+
+        if version != VERSION:
+            raise ValueError(f"Binary keep version {version} isn't supported, only {VERSION}")
+
+        if template_count != len(templates) or catalog != catalog_hash(templates):
+            raise ValueError("The keep was encoded from different templates, check the options and game version")
+
+        self.width: int = width
+        self._record: struct.Struct = _record(templates)[1]
+        self._count: int = count
+
+        if len(self._view) != HEADER.size + count * self._record.size:
+            raise ValueError(f"Expected {count} objectives, the data is the wrong length for that")
+
+    def entry(self, position: int) -> Tuple[int, Tuple[int, ...]]:
+        """
+        Returns the template index and placeholder value indices of an objective, without rendering it.
+        """
+
+        position = range(self._count)[position]
+        fields: Tuple[int, ...] = self._record.unpack_from(self._view, HEADER.size + position * self._record.size)
+
+        return fields[0], fields[1:1 + len(self.templates[fields[0]].keys)]
+
+    def _render(self, fields: Tuple[int, ...]) -> str:
+        template: CompiledTemplate = self.templates[fields[0]]
+        return template.render(template.index(fields[1:1 + len(template.keys)]))
+
+    def __getitem__(self, position: int) -> str:
+        position = range(self._count)[position]
+        return self._render(self._record.unpack_from(self._view, HEADER.size + position * self._record.size))
+
+    def __iter__(self) -> Iterator[str]:
+        for fields in self._record.iter_unpack(self._view[HEADER.size:]):
+            yield self._render(fields)
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=200, help="random option sets per game")
+    parser.add_argument("--count", type=int, default=40, help="objectives per keep")
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(arguments)
+
+    load_implementations(offline=True)
+
+    failures: int = 0
+
+    for game_cls in game_classes().values():
+        string_bytes: int = 0
+        binary_bytes: int = 0
+        decode_seconds: float = 0.0
+
+        for options, seed in feasible_cases(game_cls, args.cases, Random(args.seed)):
+            game: Any = make_game(game_cls, options)
+            templates: Sequence[CompiledTemplate] = weight_table(game).templates
+
+            objectives: List[str] = generate_objectives(game, seed, args.count)
+            encoded: bytes = encode_objectives(templates, objectives)
+
+            started: float = time.perf_counter()
+            decoded: List[str] = list(KeepView(encoded, templates))
+            decode_seconds += time.perf_counter() - started
+
+            if decoded != objectives:
+                failures += 1
+                print(f"{game_cls.name} {options} seed {seed} doesn't round trip", file=sys.stderr)
+
+            string_bytes += len(json.dumps(objectives).encode("utf-8"))
+            binary_bytes += len(encoded)
+
+        print(
+            f"{game_cls.name}: {args.cases} keeps, {string_bytes} bytes as JSON strings, {binary_bytes} binary "
+            f"({binary_bytes / string_bytes:.0%}), decoded in {decode_seconds * 1000:.1f} ms"
+        )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""
+Catalog overlays for long-running hosts, and caches that know which catalogs they were built from.
+
+An overlay is a JSON file of replacement catalogs per game, using the names in each game file's catalogs dict:
+
+    {
+        "Bloons TD 6": {"expert_maps": ["Tricky Tracks", "..."]},
+        "Umamusume: Pretty Derby": {"races_g1": ["..."], "trainees_owned": ["..."]}
+    }
+
+"trainees_owned" replaces the default of Umamusume's trainee list option. An OverlayWatcher polls the file's
+modification time, and when it changes, swaps in the new catalogs all at once and drops only the DependencyCache
+entries that were built from a catalog that changed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import types
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterator, List, Optional, Set, Tuple
+
+from .implementations import game_classes, load_implementations
+
+# (module name, catalog name)
+CatalogKey = Tuple[str, str]
+
+# Overlay entries that replace an option default rather than a catalog: name -> (module name, option class)
+OPTION_DEFAULTS: Dict[str, Tuple[str, str]] = {
+    "trainees_owned": ("umamusume_pretty_derby", "UmamusumePrettyDerbyTraineesOwned"),
+}
+
+_tracking = threading.local()
+_installing: threading.Lock = threading.Lock()
+_caches: List[DependencyCache] = list()
+_original_defaults: Dict[str, Any] = dict()
+
+
+class TrackedOverrides(dict):
+    """
+    The catalog_overrides of a game module, reporting every catalog looked up to the thread's current tracking_reads.
+    """
+
+    def __init__(self, module_name: str, overrides: Dict[str, List[str]]) -> None:
+        super().__init__(overrides)
+        self.module_name: str = module_name
+
+    def get(self, name: str, default: Any = None) -> Any:
+        reads: Optional[Set[CatalogKey]] = getattr(_tracking, "reads", None)
+
+        if reads is not None:
+            reads.add((self.module_name, name))
+
+        return super().get(name, default)
+
+
+def _install_tracking() -> Dict[str, types.ModuleType]:
+    modules: Dict[str, types.ModuleType] = load_implementations()
+
+    with _installing:
+        for module_name, module in modules.items():
+            if not isinstance(module.catalog_overrides, TrackedOverrides):
+                module.catalog_overrides = TrackedOverrides(module_name, module.catalog_overrides)
+
+    return modules
+
+
+@contextmanager
+def tracking_reads() -> Iterator[Set[CatalogKey]]:
+    """
+    Collects the catalogs read on this thread while the block runs.
+    """
+
+    _install_tracking()
+
+    outer: Optional[Set[CatalogKey]] = getattr(_tracking, "reads", None)
+    reads: Set[CatalogKey] = set()
+
+    _tracking.reads = reads
+
+    try:
+        yield reads
+    finally:
+        _tracking.reads = outer
+
+        if outer is not None:
+            outer.update(reads)
+
+
+class _CacheEntry:
+    __slots__ = ("reads", "value", "used")
+
+    def __init__(self, reads: FrozenSet[CatalogKey], value: Any) -> None:
+        self.reads: FrozenSet[CatalogKey] = reads
+        self.value: Any = value
+        self.used: int = time.monotonic_ns()
+
+    def hit(self) -> Any:
+        # An entry built on top of this one depends on the same catalogs, so they count as read by its build
+        reads: Optional[Set[CatalogKey]] = getattr(_tracking, "reads", None)
+
+        if reads is not None:
+            reads.update(self.reads)
+
+        return self.value
+
+
+class DependencyCache:
+    """
+    A size-bounded LRU cache whose entries remember the catalogs they were built from.
+
+    Safe to share between threads, including on free-threaded Python. Lookups of cached values don't take a lock:
+    the entries are kept in a dict that is never changed once published, and writers publish a new one instead.
+    Only one thread builds a missing key; others asking for it meanwhile wait for that build. Once full, the least
+    recently used quarter is evicted in one go, so a stream of new keys doesn't scan every entry on each insert.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries: int = max_entries
+
+        self._entries: Dict[Hashable, _CacheEntry] = dict()
+        self._building: Dict[Hashable, threading.Event] = dict()
+        self._lock: threading.Lock = threading.Lock()
+        # Bumped by every invalidate, so a build that was running at the time isn't stored
+        self._generation: int = 0
+
+        _caches.append(self)
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        entry: Optional[_CacheEntry] = self._entries.get(key)
+
+        if entry is not None:
+            # Unlocked, so a racing hit may leave an older time behind, which only changes what is evicted first
+            entry.used = time.monotonic_ns()
+            return entry.hit()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                return entry.hit()
+
+            building: Optional[threading.Event] = self._building.get(key)
+            generation: int = self._generation
+
+            if building is None:
+                self._building[key] = threading.Event()
+
+        if building is not None:
+            # Either the value is there once the build finishes, or the build failed and this thread tries itself
+            building.wait()
+            return self.get(key, build)
+
+        try:
+            with tracking_reads() as reads:
+                value: Any = build()
+
+            with self._lock:
+                if generation != self._generation:
+                    # The catalogs may have changed after build read them, so the value is only used this once
+                    return value
+
+                entries: Dict[Hashable, _CacheEntry] = dict(self._entries)
+                entries[key] = _CacheEntry(frozenset(reads), value)
+
+                if len(entries) > self.max_entries:
+                    kept: int = self.max_entries - self.max_entries // 4
+                    newest: List[Hashable] = sorted(entries, key=lambda cached: entries[cached].used)[-kept:]
+                    entries = {cached: entries[cached] for cached in newest} if kept else dict()
+
+                self._entries = entries
+        finally:
+            with self._lock:
+                self._building.pop(key).set()
+
+        return value
+
+    def invalidate(self, changed: Set[CatalogKey]) -> int:
+        with self._lock:
+            entries: Dict[Hashable, _CacheEntry] = {
+                key: entry for key, entry in self._entries.items() if not entry.reads & changed
+            }
+
+            stale: int = len(self._entries) - len(entries)
+            self._entries = entries
+            self._generation += 1
+
+        return stale
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def invalidate(changed: Set[CatalogKey]) -> int:
+    """
+    Drops every cached entry built from one of the changed catalogs, returning how many there were.
+    """
+
+    return sum(cache.invalidate(changed) for cache in _caches)
+
+
+def apply_overlay(overlay: Dict[str, Dict[str, List[str]]]) -> Set[CatalogKey]:
+    """
+    Swaps in the catalogs of an overlay, replacing any earlier overlay, and returns the catalogs that changed.
+
+    Raises ValueError without changing anything if the overlay isn't shaped like one, or names a game or catalog
+    that doesn't exist.
+    """
+
+    if not isinstance(overlay, dict):
+        raise ValueError("The overlay needs to be an object of games")
+
+    modules: Dict[str, types.ModuleType] = _install_tracking()
+    module_names: Dict[str, str] = {name: cls.__module__.rsplit(".", 1)[-1] for name, cls in game_classes().items()}
+
+    for game_name, catalogs in overlay.items():
+        if game_name not in module_names:
+            raise ValueError(f"The overlay has catalogs for {game_name}, which isn't an implementation here")
+
+        if not isinstance(catalogs, dict):
+            raise ValueError(f"The overlay's {game_name} entry needs to be an object of catalogs")
+
+        module: types.ModuleType = modules[module_names[game_name]]
+
+        for name, values in catalogs.items():
+            if name not in module.catalogs and OPTION_DEFAULTS.get(name, ("",))[0] != module_names[game_name]:
+                raise ValueError(f"{game_name} has no catalog called {name}")
+
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                raise ValueError(f"{game_name} {name} needs to be a list of names")
+
+    changed: Set[CatalogKey] = set()
+
+    for game_name, module_name in module_names.items():
+        module = modules[module_name]
+        catalogs: Dict[str, List[str]] = dict(overlay.get(game_name, dict()))
+
+        for name, (option_module_name, option_cls_name) in OPTION_DEFAULTS.items():
+            if option_module_name != module_name:
+                continue
+
+            option_cls: Any = getattr(module, option_cls_name)
+            _original_defaults.setdefault(name, option_cls.default)
+
+            # Options resolved from the new default get a new fingerprint, so no cache entries need dropping here
+            option_cls.default = catalogs.pop(name, _original_defaults[name])
+
+        current: Dict[str, List[str]] = dict(module.catalog_overrides)
+
+        for name in set(current) | set(catalogs):
+            if current.get(name) != catalogs.get(name):
+                changed.add((module_name, name))
+
+        # One assignment, so lookups see either all of the old overlay or all of the new one
+        module.catalog_overrides = TrackedOverrides(module_name, catalogs)
+
+    invalidate(changed)
+
+    return changed
+
+
+class OverlayWatcher:
+    """
+    Polls an overlay file and applies it whenever it changes. A file that fails to load leaves the last good
+    overlay in place, and the error is kept in last_error.
+    """
+
+    def __init__(self, path: str, interval: float = 5.0) -> None:
+        self.path: str = path
+        self.interval: float = interval
+        self.last_error: Optional[Exception] = None
+
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._stop: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self) -> Set[CatalogKey]:
+        """
+        Applies the overlay if the file changed since the last poll, returning the catalogs that changed.
+        """
+
+        stat: Optional[os.stat_result]
+
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            stat = None
+
+        stamp: Optional[Tuple[int, int]] = (stat.st_mtime_ns, stat.st_size) if stat else None
+
+        if stamp == self._stamp:
+            return set()
+
+        self._stamp = stamp
+
+        try:
+            overlay: Dict[str, Dict[str, List[str]]] = dict()
+
+            if stamp is not None:
+                with open(self.path, encoding="utf-8") as file:
+                    overlay = json.load(file)
+
+            changed: Set[CatalogKey] = apply_overlay(overlay)
+        except (OSError, ValueError) as error:
+            self.last_error = error
+            return set()
+
+        self.last_error = None
+        return changed
+
+    def start(self) -> None:
+        self.poll()
+
+        self._thread = threading.Thread(target=self._run, name="catalog-overlay", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll()
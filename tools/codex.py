@@ -0,0 +1,183 @@
+"""
+Exports every objective template and its pools to JSONL for the codex, re-emitting only what changed.
+
+    python -m tools.codex --output codex.jsonl --changes changes.jsonl
+    python -m tools.codex --overlay roster.json     with the catalogs of an overlay (see catalogs.py)
+
+Each line of the export is one template of a game with every option included: its label, flags and weight, the
+pool of each placeholder, how many objectives it can produce, and the SHA-256 of all of that. Templates aren't
+expanded, the codex site can do that from the pools.
+
+The previous export is read back first, and only entries whose hash is new or different are written to the changes
+file, along with a line for each entry that's gone, so adding one trainee only republishes the templates that draw
+trainees.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Type
+
+from .catalogs import apply_overlay
+from .implementations import game_classes, load_implementations, make_game, option_classes
+from .weights import weight_table
+
+Entry = Dict[str, Any]
+
+
+def codex_options(game_cls: Type[Any]) -> Dict[str, Any]:
+    """
+    Option values that include everything: every toggle on, every set option with all its keys, full lists.
+    """
+
+    values: Dict[str, Any] = dict()
+
+    for option_name, option_cls in option_classes(game_cls).items():
+        valid_keys: Any = getattr(option_cls, "valid_keys", None)
+
+        if valid_keys:
+            values[option_name] = sorted(valid_keys)
+        elif isinstance(option_cls.default, (list, tuple)):
+            values[option_name] = list(option_cls.default)
+        else:
+            values[option_name] = True
+
+    return values
+
+
+def entry_hash(entry: Entry) -> str:
+    content: Entry = {name: value for name, value in entry.items() if name != "sha256"}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def codex_entries(game_cls: Type[Any]) -> List[Entry]:
+    """
+    Returns the export entries of a game, one per template, in the order the game lists them.
+    """
+
+    game: Any = make_game(game_cls, codex_options(game_cls))
+
+    entries: List[Entry] = list()
+    seen: Dict[str, int] = dict()
+
+    for template in weight_table(game).templates:
+        # Some labels are shared by templates with different pools, like Umamusume's races of each grade
+        seen[template.label] = seen.get(template.label, 0) + 1
+        occurrence: int = seen[template.label]
+
+        entry: Entry = {
+            "id": f"{game_cls.name}: {template.label}" + (f" #{occurrence}" if occurrence > 1 else ""),
+            "game": game_cls.name,
+            "label": template.label,
+            "placeholders": {key: list(pool) for key, pool in zip(template.keys, template.pools)},
+            "count": template.count,
+            "is_time_consuming": template.template.is_time_consuming,
+            "is_difficult": template.template.is_difficult,
+            "weight": template.template.weight,
+        }
+
+        entry["sha256"] = entry_hash(entry)
+        entries.append(entry)
+
+    return entries
+
+
+def read_export(path: Path) -> Dict[str, str]:
+    """
+    Returns the hash of each entry of a previous export by id, or nothing if there isn't one.
+    """
+
+    if not path.exists():
+        return dict()
+
+    hashes: Dict[str, str] = dict()
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                entry: Entry = json.loads(line)
+                hashes[entry["id"]] = entry["sha256"]
+
+    return hashes
+
+
+def _write_line(out: TextIO, entry: Entry) -> None:
+    out.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+    out.write("\n")
+
+
+def write_changes(out: TextIO, entries: List[Entry], previous: Dict[str, str]) -> Tuple[int, int, int]:
+    """
+    Writes the entries that are new or changed since the previous export, then the ids that were removed.
+
+    Returns how many were added, changed and removed.
+    """
+
+    added: int = 0
+    changed: int = 0
+
+    for entry in entries:
+        old: Optional[str] = previous.get(entry["id"])
+
+        if old == entry["sha256"]:
+            continue
+
+        if old is None:
+            added += 1
+        else:
+            changed += 1
+
+        _write_line(out, {"change": "added" if old is None else "changed", **entry})
+
+    current: Dict[str, str] = {entry["id"]: entry["sha256"] for entry in entries}
+    removed: List[str] = [entry_id for entry_id in previous if entry_id not in current]
+
+    for entry_id in removed:
+        _write_line(out, {"change": "removed", "id": entry_id})
+
+    return added, changed, len(removed)
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", type=Path, default=Path("codex.jsonl"), help="the full export, read back next run")
+    parser.add_argument("--changes", type=str, default="-", help="file for the changed entries, or - for stdout")
+    parser.add_argument("--overlay", type=Path, help="a catalog overlay to export with")
+
+    args = parser.parse_args(arguments)
+
+    load_implementations(offline=True)
+
+    if args.overlay is not None:
+        with open(args.overlay, encoding="utf-8") as file:
+            apply_overlay(json.load(file))
+
+    entries: List[Entry] = [entry for game_cls in game_classes().values() for entry in codex_entries(game_cls)]
+    previous: Dict[str, str] = read_export(args.output)
+
+    if args.changes == "-":
+        counts: Tuple[int, int, int] = write_changes(sys.stdout, entries, previous)
+    else:
+        with open(args.changes, "w", encoding="utf-8", newline="\n") as file:
+            counts = write_changes(file, entries, previous)
+
+    with open(args.output, "w", encoding="utf-8", newline="\n") as file:
+        for entry in entries:
+            _write_line(file, entry)
+
+    print(
+        f"{counts[0]} added, {counts[1]} changed, {counts[2]} removed, "
+        f"{len(entries) - counts[0] - counts[1]} unchanged",
+        file=sys.stderr,
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Combination indexing for objective templates, and single objective rerolls built on top of it.
+
+Every placeholder in these implementations draws exactly one value, so the objectives a template can produce
+can be numbered with a mixed radix over its placeholder pools, in the order of the template's data.
+Sets of combinations are stored as plain ints used as bitmaps, where bit i being set means combination i.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import re
+from random import Random
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Pattern, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from .streams import PlaceholderBags
+
+# How many random picks a reroll tries before falling back to walking the free combinations.
+REROLL_ATTEMPTS: int = 16
+
+
+class CompiledTemplate:
+    """
+    A snapshot of a GameObjectiveTemplate with its placeholder pools resolved.
+
+    Duplicate values in a pool (trainee lists allow them, to raise odds) are only counted once,
+    since they would render the same objective anyway. draws keeps the odds: for each pool, the value index of every
+    entry of the pool as the game lists it, so picking an entry of it uniformly picks values as often as the host does.
+    """
+
+    __slots__ = ("template", "label", "keys", "pools", "draws", "count", "template_id", "_parser")
+
+    def __init__(self, template: Any) -> None:
+        self.template = template
+        self.label: str = template.label
+        self.keys: Tuple[str, ...] = tuple(template.data)
+
+        pools: List[Tuple[str, ...]] = list()
+        draws: List[Tuple[int, ...]] = list()
+
+        for key, (collection, count) in template.data.items():
+            if count != 1:
+                raise ValueError(f"Placeholder {key} of '{self.label}' draws {count} values, only 1 is supported")
+
+            values: List[str] = list(collection())
+            lookup: Dict[str, int] = {value: i for i, value in enumerate(dict.fromkeys(values))}
+
+            pools.append(tuple(lookup))
+            draws.append(tuple(lookup[value] for value in values))
+
+        self.pools: Tuple[Tuple[str, ...], ...] = tuple(pools)
+        self.draws: Tuple[Tuple[int, ...], ...] = tuple(draws)
+        self.count: int = math.prod(len(pool) for pool in self.pools)
+
+        # Shared by every template with the same label and pools, set the first time one is interned (see interning.py)
+        self.template_id: Optional[int] = None
+
+        # Built on the first parse, and set in one go so threads never see half of it
+        self._parser: Optional[Tuple[Pattern[str], Tuple[Dict[str, int], ...]]] = None
+
+    def value_indices(self, index: int) -> Tuple[int, ...]:
+        indices: List[int] = list()
+
+        for pool in self.pools:
+            index, value_index = divmod(index, len(pool))
+            indices.append(value_index)
+
+        return tuple(indices)
+
+    def index(self, value_indices: Iterable[int]) -> int:
+        index: int = 0
+        radix: int = 1
+
+        for pool, value_index in zip(self.pools, value_indices):
+            index += value_index * radix
+            radix *= len(pool)
+
+        return index
+
+    def render(self, index: int) -> str:
+        # Mirrors GameObjectiveTemplate.generate_game_objective, which replaces the keys in data order
+        objective: str = self.label
+
+        for key, pool, value_index in zip(self.keys, self.pools, self.value_indices(index)):
+            objective = objective.replace(key, pool[value_index])
+
+        return objective
+
+    def parse(self, objective: str) -> Optional[int]:
+        """
+        Returns the combination index that renders to the given objective, or None if this template can't produce it.
+        """
+
+        if self._parser is None:
+            self._parser = (
+                _label_pattern(self.label, self.keys, self.pools),
+                tuple({value: i for i, value in enumerate(pool)} for pool in self.pools),
+            )
+
+        pattern, lookups = self._parser
+        match = pattern.fullmatch(objective)
+
+        if match is None:
+            return None
+
+        value_indices: List[int] = list()
+
+        for position, lookup in enumerate(lookups):
+            value_index: Optional[int] = lookup.get(match.group(f"p{position}"))
+
+            if value_index is None:
+                return None
+
+            value_indices.append(value_index)
+
+        return self.index(value_indices)
+
+
+def catalog_hash(templates: Sequence[CompiledTemplate]) -> bytes:
+    """
+    Returns the SHA-256 of every label, placeholder key and pool of templates, in order, so two lists of templates
+    can be told apart when their combination indices wouldn't mean the same objectives.
+    """
+
+    catalog: List[Any] = [[template.label, template.keys, template.pools] for template in templates]
+    return hashlib.sha256(json.dumps(catalog, separators=(",", ":")).encode("utf-8")).digest()
+
+
+def _label_pattern(label: str, keys: Tuple[str, ...], pools: Tuple[Tuple[str, ...], ...]) -> Pattern[str]:
+    missing: List[str] = [key for key in keys if key not in label]
+
+    if missing:
+        raise ValueError(f"'{label}' does not use its placeholders {', '.join(missing)}")
+
+    if not keys:
+        return re.compile(re.escape(label), re.DOTALL)
+
+    positions: Dict[str, int] = {key: position for position, key in enumerate(keys)}
+    splitter: Pattern[str] = re.compile("|".join(re.escape(key) for key in sorted(keys, key=len, reverse=True)))
+
+    pattern: List[str] = list()
+    seen: Set[str] = set()
+    end: int = 0
+
+    for match in splitter.finditer(label):
+        pattern.append(re.escape(label[end:match.start()]))
+
+        position: int = positions[match.group()]
+        group: str = f"p{position}"
+
+        if group in seen:
+            pattern.append(f"(?P={group})")
+        else:
+            # Only the pool's own values can match, so the regex backtracks past ambiguous splits
+            values: List[str] = sorted(pools[position], key=len, reverse=True)
+            pattern.append(f"(?P<{group}>{'|'.join(re.escape(value) for value in values)})")
+
+        seen.add(group)
+        end = match.end()
+
+    pattern.append(re.escape(label[end:]))
+
+    return re.compile("".join(pattern), re.DOTALL)
+
+
+def free_combination(count: int, used: int, random: Random) -> Optional[int]:
+    """
+    Picks a combination below count whose bit isn't set in used, or None if there are none left.
+
+    Random picks are tried first, which is O(1) expected while the bitmap isn't nearly full.
+    """
+
+    used &= (1 << count) - 1
+    free: int = count - used.bit_count()
+
+    if free <= 0:
+        return None
+
+    for _ in range(REROLL_ATTEMPTS):
+        index: int = random.randrange(count)
+
+        if not used >> index & 1:
+            return index
+
+    # Nearly every combination is used, so walk to a random free one instead
+    skip: int = random.randrange(free)
+
+    for index in range(count):
+        if not used >> index & 1:
+            if not skip:
+                return index
+
+            skip -= 1
+
+    return None
+
+
+class RerollIndex:
+    """
+    Tracks which combinations each objective template of a game has already used, so that a single objective
+    can be replaced without regenerating the rest of the slot.
+
+    Templates are compiled once, when the index is created, and replacements come from the same template as the
+    objective they replace. If the slot was generated with PlaceholderBags, passing them (or bags restored from their
+    state) deals replacements from the same cycles.
+    """
+
+    def __init__(
+        self,
+        game: Any,
+        objectives: Iterable[str] = (),
+        random: Optional[Random] = None,
+        bags: Optional[PlaceholderBags] = None,
+    ) -> None:
+        self.game = game
+        self.random: Random = random or game.random
+        self.bags: Optional[PlaceholderBags] = bags
+
+        self.templates: List[CompiledTemplate] = [
+            CompiledTemplate(template) for template in game.game_objective_templates()
+        ]
+
+        self.used: List[int] = [0] * len(self.templates)
+
+        for objective in objectives:
+            self.mark(objective)
+
+    def locate(self, objective: str) -> Optional[Tuple[int, int]]:
+        for template_index, template in enumerate(self.templates):
+            index: Optional[int] = template.parse(objective)
+
+            if index is not None:
+                return template_index, index
+
+        return None
+
+    def mark(self, objective: str) -> bool:
+        located: Optional[Tuple[int, int]] = self.locate(objective)
+
+        if located is None:
+            return False
+
+        template_index, index = located
+        self.used[template_index] |= 1 << index
+
+        return True
+
+    def exclude(self, masks: Iterable[int]) -> None:
+        """
+        Marks combinations as used, from one bitmap per template, so rerolls never land on them.
+        """
+
+        for template_index, mask in enumerate(masks):
+            self.used[template_index] |= mask
+
+    def reroll(self, objective: str) -> Optional[str]:
+        """
+        Returns a replacement for the objective that hasn't been used yet, or None if its template has run out.
+
+        The objective being replaced is marked as used, so it won't come back on a later reroll.
+        """
+
+        located: Optional[Tuple[int, int]] = self.locate(objective)
+
+        if located is None:
+            raise ValueError(f"'{objective}' can't be produced by any {self.game.name} objective template")
+
+        template_index, index = located
+        template: CompiledTemplate = self.templates[template_index]
+
+        self.used[template_index] |= 1 << index
+        replacement: Optional[int]
+
+        if self.bags is not None:
+            replacement = self.bags.draw_unused(template, self.used[template_index], self.random)
+        else:
+            replacement = free_combination(template.count, self.used[template_index], self.random)
+
+        if replacement is None:
+            return None
+
+        self.used[template_index] |= 1 << replacement
+
+        return template.render(replacement)
@@ -0,0 +1,236 @@
+"""
+Checks that an optimized generation path gives exactly the same objectives as the reference one, and how much
+faster and smaller it is.
+
+The reference path is what a slot does today: choose an optional constraint, then repeatedly pick a template from
+game_objective_templates by weight and call its generate_game_objective, all on one Random seeded for the slot.
+Candidate paths get the same game, seed and count, and their output has to match byte for byte.
+
+    python -m tools.compare_generation --cases 2000
+    python -m tools.compare_generation --slots-per-options 20     each option set shared by 20 slots
+    python -m tools.compare_generation --candidate my_module:my_path
+
+A candidate is a function (game, seed, count) -> List[str]. The exit code is 1 if any candidate differs. Games are
+created before the clock starts, so the times are generation alone. With --slots-per-options 1, every case has
+options of its own and paths that build per-option state pay for it every time; in a multiworld, most slots share
+a handful of option sets, usually the defaults, which is what a higher value models.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import time
+import tracemalloc
+
+from random import Random
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from .flyweights import flyweight_objectives
+from .implementations import game_classes, make_game, option_classes
+
+GenerationPath = Callable[[Any, int, int], List[str]]
+
+# How many differences to print per game and candidate
+MAX_REPORTED: int = 5
+
+
+def reference_objectives(game: Any, seed: int, count: int) -> List[str]:
+    random: Random = Random(seed)
+    objectives: List[str] = list()
+
+    constraints: List[Any] = game.optional_game_constraint_templates()
+
+    if constraints:
+        objectives.append(random.choice(constraints).generate_game_objective(random))
+
+    templates: List[Any] = game.game_objective_templates()
+    weights: List[int] = [template.weight for template in templates]
+
+    for _ in range(count):
+        template: Any = random.choices(templates, weights=weights)[0]
+        objectives.append(template.generate_game_objective(random))
+
+    return objectives
+
+
+CANDIDATES: Dict[str, GenerationPath] = {
+    "flyweights": flyweight_objectives,
+}
+
+
+def random_options(game_cls: Type[Any], random: Random) -> Dict[str, Any]:
+    """
+    Rolls a value for every option. Lists get a random slice of their default, with the odd duplicate.
+    """
+
+    values: Dict[str, Any] = dict()
+
+    for option_name, option_cls in option_classes(game_cls).items():
+        valid_keys: Any = getattr(option_cls, "valid_keys", None)
+
+        if valid_keys:
+            keys: List[str] = list(valid_keys)
+            values[option_name] = random.sample(keys, random.randint(1, len(keys)))
+        elif isinstance(option_cls.default, (list, tuple)):
+            pool: List[str] = list(option_cls.default)
+            chosen: List[str] = random.sample(pool, random.randint(1, len(pool)))
+
+            if random.random() < 0.1:
+                chosen.extend(random.choices(chosen, k=3))
+
+            values[option_name] = chosen
+        else:
+            values[option_name] = random.random() < 0.5
+
+    return values
+
+
+def feasible_cases(
+    game_cls: Type[Any], cases: int, random: Random, slots_per_options: int = 1
+) -> List[Tuple[Dict[str, Any], int]]:
+    """
+    Rolls option sets that have no errors, each with slots_per_options slot seeds, until there are cases of them.
+    """
+
+    generated: List[Tuple[Dict[str, Any], int]] = list()
+
+    while len(generated) < cases:
+        options: Dict[str, Any] = random_options(game_cls, random)
+
+        problems = make_game(game_cls, options).option_problems()
+
+        if any(level == "error" for level, _ in problems):
+            continue
+
+        for _ in range(min(slots_per_options, cases - len(generated))):
+            generated.append((options, random.getrandbits(64)))
+
+    return generated
+
+
+def _run(path: GenerationPath, slots: List[Tuple[Any, int]], count: int) -> Tuple[List[List[str]], float]:
+    outputs: List[List[str]] = list()
+    started: float = time.perf_counter()
+
+    for game, seed in slots:
+        outputs.append(path(game, seed, count))
+
+    return outputs, time.perf_counter() - started
+
+
+def _peak_memory(path: GenerationPath, slots: List[Tuple[Any, int]], count: int) -> int:
+    tracemalloc.start()
+
+    try:
+        _run(path, slots, count)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare(
+    candidates: Dict[str, GenerationPath], cases: int, count: int, seed: int, slots_per_options: int = 1
+) -> Tuple[List[Tuple[Any, ...]], List[str]]:
+    rows: List[Tuple[Any, ...]] = list()
+    differences: List[str] = list()
+
+    for game_name, game_cls in game_classes().items():
+        game_cases: List[Tuple[Dict[str, Any], int]] = feasible_cases(
+            game_cls, cases, Random(f"{seed}{game_name}"), slots_per_options
+        )
+
+        # (game, slot seed) for each case, made before any timing
+        slots: List[Tuple[Any, int]] = [(make_game(game_cls, options), case_seed) for options, case_seed in game_cases]
+
+        expected, reference_time = _run(reference_objectives, slots, count)
+        reference_memory: int = _peak_memory(reference_objectives, slots, count)
+
+        rows.append((game_name, "reference", len(game_cases), "-", reference_time, 1.0, reference_memory, "-"))
+
+        for name, path in candidates.items():
+            actual, candidate_time = _run(path, slots, count)
+            candidate_memory: int = _peak_memory(path, slots, count)
+
+            mismatches: int = 0
+
+            for (options, case_seed), want, got in zip(game_cases, expected, actual):
+                if want == got:
+                    continue
+
+                mismatches += 1
+
+                if mismatches <= MAX_REPORTED:
+                    first: int = next(
+                        (i for i, (a, b) in enumerate(zip(want, got)) if a != b), min(len(want), len(got))
+                    )
+
+                    differences.append(
+                        f"{game_name} / {name}: seed {case_seed}, objective {first}\n"
+                        f"  options:   {options}\n"
+                        f"  reference: {want[first] if first < len(want) else '<missing>'}\n"
+                        f"  candidate: {got[first] if first < len(got) else '<missing>'}"
+                    )
+
+            memory_change: str = f"{(candidate_memory - reference_memory) / max(reference_memory, 1):+.0%}"
+
+            rows.append((
+                game_name,
+                name,
+                len(game_cases),
+                mismatches,
+                candidate_time,
+                reference_time / max(candidate_time, 1e-9),
+                candidate_memory,
+                memory_change,
+            ))
+
+    return rows, differences
+
+
+def format_table(rows: List[Tuple[Any, ...]]) -> str:
+    header: Tuple[str, ...] = ("game", "path", "cases", "mismatches", "time (s)", "speedup", "peak KiB", "memory")
+
+    cells: List[Tuple[str, ...]] = [header] + [
+        (game, path, str(cases), str(mismatches), f"{seconds:.3f}", f"{speedup:.2f}x", f"{peak / 1024:.0f}", memory)
+        for game, path, cases, mismatches, seconds, speedup, peak, memory in rows
+    ]
+
+    widths: List[int] = [max(len(row[column]) for row in cells) for column in range(len(header))]
+
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in cells)
+
+
+def _load_candidate(reference: str) -> Tuple[str, GenerationPath]:
+    module_name, _, function_name = reference.partition(":")
+    return reference, getattr(importlib.import_module(module_name), function_name)
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=1000, help="random option sets and seeds per game")
+    parser.add_argument("--count", type=int, default=20, help="objectives generated per case")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the option sets and slot seeds")
+    parser.add_argument("--slots-per-options", type=int, default=1, help="cases sharing each random option set")
+    parser.add_argument(
+        "--candidate", action="append", default=list(), help="extra path to compare, as module:function"
+    )
+
+    args = parser.parse_args(arguments)
+
+    candidates: Dict[str, GenerationPath] = dict(CANDIDATES)
+    candidates.update(_load_candidate(reference) for reference in args.candidate)
+
+    rows, differences = compare(candidates, args.cases, args.count, args.seed, args.slots_per_options)
+
+    print(format_table(rows))
+
+    for difference in differences:
+        print(difference)
+
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Precomputed compatibility between each game's optional constraints and its objectives.
+
+Games list the objectives a constraint rules out in constraint_conflicts. Those rules are compiled once per
+option fingerprint into bitsets, so once a constraint is picked, the objectives that still work with it are a
+lookup instead of a flag check or a reroll after the fact:
+
+- compatible_templates[constraint] has bit t set if template t has at least one objective that works.
+- blocked[constraint][t] has bit i set if combination i of template t is ruled out (see combinations.py).
+"""
+
+from __future__ import annotations
+
+import itertools
+
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .catalogs import DependencyCache
+from .combinations import CompiledTemplate
+from .implementations import options_fingerprint
+
+Conflict = Tuple[str, Optional[str], Dict[str, Optional[List[str]]]]
+
+MAX_MATRICES: int = 256
+
+_matrices: DependencyCache = DependencyCache(MAX_MATRICES)
+
+
+def conflict_mask(
+    template: CompiledTemplate, objective_label: Optional[str], values: Dict[str, Optional[List[str]]]
+) -> int:
+    """
+    Returns the bitmap of a template's combinations that one conflict rule rules out.
+    """
+
+    if objective_label is not None and objective_label != template.label:
+        return 0
+
+    if any(key not in template.keys for key in values):
+        return 0
+
+    choices: List[Iterable[int]] = list()
+
+    for key, pool in zip(template.keys, template.pools):
+        wanted: Optional[List[str]] = values.get(key)
+
+        if wanted is None:
+            choices.append(range(len(pool)))
+        else:
+            choices.append([i for i, value in enumerate(pool) if value in wanted])
+
+    mask: int = 0
+
+    for value_indices in itertools.product(*choices):
+        mask |= 1 << template.index(value_indices)
+
+    return mask
+
+
+class CompatibilityMatrix:
+    __slots__ = ("templates", "constraints", "blocked", "compatible_templates")
+
+    def __init__(self, templates: List[CompiledTemplate], constraints: List[str], conflicts: List[Conflict]) -> None:
+        self.templates: Tuple[CompiledTemplate, ...] = tuple(templates)
+        self.constraints: Tuple[str, ...] = tuple(constraints)
+
+        self.blocked: Dict[str, Tuple[int, ...]] = dict()
+        self.compatible_templates: Dict[str, int] = dict()
+
+        for constraint in self.constraints:
+            rules: List[Conflict] = [conflict for conflict in conflicts if conflict[0] == constraint]
+            blocked: List[int] = list()
+            compatible: int = 0
+
+            for template_index, template in enumerate(self.templates):
+                mask: int = 0
+
+                for _, objective_label, values in rules:
+                    mask |= conflict_mask(template, objective_label, values)
+
+                blocked.append(mask)
+
+                if mask.bit_count() < template.count:
+                    compatible |= 1 << template_index
+
+            self.blocked[constraint] = tuple(blocked)
+            self.compatible_templates[constraint] = compatible
+
+    def compatible(self, constraint: str) -> List[CompiledTemplate]:
+        bits: int = self.compatible_templates.get(constraint, (1 << len(self.templates)) - 1)
+        return [template for i, template in enumerate(self.templates) if bits >> i & 1]
+
+
+def compatibility_matrix(game: Any) -> CompatibilityMatrix:
+    """
+    Returns the compatibility matrix for a game's options, building it the first time those options are seen.
+
+    Template indices follow game_objective_templates, the same as a RerollIndex for the game.
+    """
+
+    def build() -> CompatibilityMatrix:
+        templates: List[CompiledTemplate] = [CompiledTemplate(template) for template in game.game_objective_templates()]
+
+        # Constraints are told apart by their unfilled labels, e.g. "Use TRAINEE to complete these goals..."
+        constraints: List[str] = [template.label for template in game.optional_game_constraint_templates()]
+
+        return CompatibilityMatrix(templates, constraints, game.constraint_conflicts())
+
+    key: Hashable = options_fingerprint(game)
+    return _matrices.get(key, build)
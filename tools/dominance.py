@@ -0,0 +1,205 @@
+"""
+Dominance between objectives, so a keep never holds one that another already implies.
+
+Some objectives prove others: winning 1st in a race proves getting at least 3rd in it, clearing a map on CHIMPS
+proves clearing it on Impoppable and on Standard Hard, Medium and Easy, and beating a boss on Elite Tier 5 proves
+every lower tier of it, Elite or not. Each objective is described by a subject (the race, the map, the boss and
+map...) and the set of facts completing it proves, and one dominates another with the same subject when its facts
+are a superset of the other's.
+
+A DominanceLattice is built once per option fingerprint over every combination (see combinations.py) of the
+game's templates, in weight table order (see weights.py). For each combination it keeps bitmaps, per template, of
+the combinations it dominates and of the ones it's related to either way. streams.iter_objectives ORs the related
+bitmaps into its used combinations whenever it draws an objective, so a dominated candidate is turned down by the
+same single bit test as a repeated one. covered() extends the bitmaps of progress.compile_progress with everything
+the completed objectives dominate.
+"""
+
+from __future__ import annotations
+
+import re
+
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Pattern, Sequence, Tuple
+
+from .catalogs import DependencyCache
+from .combinations import CompiledTemplate, catalog_hash
+from .implementations import options_fingerprint
+from .medal_grid import MEDAL_SET_PREFIX
+from .progress import role_of
+from .weights import weight_table
+
+# (subject, facts proved)
+Point = Tuple[Hashable, FrozenSet[Hashable]]
+# Placeholder values by role (see progress.ROLES), or by key for placeholders without one
+PointOf = Callable[[str, Dict[str, str]], Optional[Point]]
+# (template index, bitmap of its combinations) for each template with any bit set
+Masks = Tuple[Tuple[int, int], ...]
+
+# Clearing a map on one of these also proves clearing it on every mode after it
+MODE_CHAIN: Tuple[str, ...] = ("CHIMPS", "Impoppable", "Standard Hard", "Standard Medium", "Standard Easy")
+
+# Past the last place of any race, so every "Get at least Nth" proves the ones below it
+LAST_PLACE: int = 18
+
+PLACEMENT_PATTERN: Pattern[str] = re.compile(r"(?:Win 1st|Get at least (\d+)(?:st|nd|rd|th)) in RACE(.*)")
+MATCH_PATTERN: Pattern[str] = re.compile(r"(Win|Win or Draw) against the (\w+) team available in ROUND")
+
+MAX_LATTICES: int = 256
+
+_lattices: DependencyCache = DependencyCache(MAX_LATTICES)
+
+
+def _mode_facts(mode: str) -> FrozenSet[Hashable]:
+    if mode in MODE_CHAIN:
+        return frozenset(MODE_CHAIN[MODE_CHAIN.index(mode):])
+
+    return frozenset((mode,))
+
+
+def bloons_td_6_point(label: str, values: Dict[str, str]) -> Optional[Point]:
+    if label.startswith(MEDAL_SET_PREFIX) and set(values) == {"MAP"}:
+        modes: List[str] = label[len(MEDAL_SET_PREFIX):].split(", ")
+        return ("map", values["MAP"]), frozenset().union(*(_mode_facts(mode) for mode in modes))
+
+    if label.startswith("Complete ") and set(values) == {"MAP", "MODE"}:
+        return ("map", values["MAP"]), _mode_facts(values["MODE"])
+
+    if set(values) == {"BOSS", "TIER", "MAP"}:
+        tier: int = int(values["TIER"].split()[-1])
+        kinds: Tuple[str, ...] = ("Normal", "Elite") if " Elite " in label else ("Normal",)
+
+        return ("boss", values["BOSS"], values["MAP"]), frozenset(
+            (kind, lower) for kind in kinds for lower in range(1, tier + 1)
+        )
+
+    return None
+
+
+def umamusume_pretty_derby_point(label: str, values: Dict[str, str]) -> Optional[Point]:
+    placement: Optional[re.Match[str]] = PLACEMENT_PATTERN.fullmatch(label)
+
+    if placement is not None and set(values) == {"RACE"}:
+        place: int = int(placement.group(1) or 1)
+        return ("race", values["RACE"], placement.group(2)), frozenset(range(place, LAST_PLACE + 1))
+
+    match: Optional[re.Match[str]] = MATCH_PATTERN.fullmatch(label)
+
+    if match is not None and set(values) == {"ROUND"}:
+        outcomes: Tuple[str, ...] = ("Win", "Win or Draw") if match.group(1) == "Win" else ("Win or Draw",)
+        return ("round", values["ROUND"], match.group(2)), frozenset(outcomes)
+
+    return None
+
+
+POINTS: Dict[str, PointOf] = {
+    "Bloons TD 6": bloons_td_6_point,
+    "Umamusume: Pretty Derby": umamusume_pretty_derby_point,
+}
+
+
+def _add(masks: List[Dict[int, Dict[int, int]]], objective: Tuple[int, int], other: Tuple[int, int]) -> None:
+    by_template: Dict[int, int] = masks[objective[0]].setdefault(objective[1], dict())
+    by_template[other[0]] = by_template.get(other[0], 0) | 1 << other[1]
+
+
+def _frozen(masks: Dict[int, Dict[int, int]]) -> Dict[int, Masks]:
+    return {index: tuple(sorted(by_template.items())) for index, by_template in masks.items()}
+
+
+class DominanceLattice:
+    __slots__ = ("templates", "catalog", "_dominated", "_related")
+
+    def __init__(self, templates: List[CompiledTemplate], point_of: PointOf) -> None:
+        self.templates: Tuple[CompiledTemplate, ...] = tuple(templates)
+        # Tells iter_objectives whether the lattice still matches its weight table (see combinations.catalog_hash)
+        self.catalog: bytes = catalog_hash(self.templates)
+
+        groups: Dict[Hashable, List[Tuple[int, int, FrozenSet[Hashable]]]] = dict()
+
+        for template_index, template in enumerate(self.templates):
+            roles: List[str] = [role_of(key) or key for key in template.keys]
+
+            for index in range(template.count):
+                values: Dict[str, str] = {
+                    role: pool[value_index]
+                    for role, pool, value_index in zip(roles, template.pools, template.value_indices(index))
+                }
+
+                point: Optional[Point] = point_of(template.label, values)
+
+                if point is not None:
+                    groups.setdefault(point[0], list()).append((template_index, index, point[1]))
+
+        dominated: List[Dict[int, Dict[int, int]]] = [dict() for _ in self.templates]
+        related: List[Dict[int, Dict[int, int]]] = [dict() for _ in self.templates]
+
+        # Subjects only hold a handful of objectives each, like the modes of one map, so pairs are compared directly
+        for members in groups.values():
+            for template_index, index, facts in members:
+                for other_template_index, other_index, other_facts in members:
+                    objective: Tuple[int, int] = (template_index, index)
+                    other: Tuple[int, int] = (other_template_index, other_index)
+
+                    if objective != other and facts >= other_facts:
+                        _add(dominated, objective, other)
+                        _add(related, objective, other)
+                        _add(related, other, objective)
+
+        self._dominated: Tuple[Dict[int, Masks], ...] = tuple(_frozen(masks) for masks in dominated)
+        self._related: Tuple[Dict[int, Masks], ...] = tuple(_frozen(masks) for masks in related)
+
+    def dominated(self, template_index: int, index: int) -> Masks:
+        """
+        Returns the combinations that a combination of a template dominates, as bitmaps per template.
+        """
+
+        return self._dominated[template_index].get(index, ())
+
+    def related(self, template_index: int, index: int) -> Masks:
+        """
+        Returns the combinations that a combination dominates or is dominated by, as bitmaps per template.
+        """
+
+        return self._related[template_index].get(index, ())
+
+    def dominates(self, objective: Tuple[int, int], other: Tuple[int, int]) -> bool:
+        for template_index, mask in self.dominated(*objective):
+            if template_index == other[0]:
+                return bool(mask >> other[1] & 1)
+
+        return False
+
+    def covered(self, masks: Sequence[int]) -> List[int]:
+        """
+        Returns the bitmaps of completed combinations per template, with everything they dominate added.
+        """
+
+        covered: List[int] = list(masks)
+
+        for template_index, mask in enumerate(masks):
+            while mask:
+                lowest: int = mask & -mask
+                mask ^= lowest
+
+                for other_template_index, dominated in self.dominated(template_index, lowest.bit_length() - 1):
+                    covered[other_template_index] |= dominated
+
+        return covered
+
+
+def dominance_lattice(
+    game: Any, include_difficult: bool = True, include_time_consuming: bool = True
+) -> DominanceLattice:
+    """
+    Returns the dominance lattice for a game's options, building it the first time those options are seen.
+
+    Template indices follow the game's weight table with the same filters, the same as streams.iter_objectives and
+    progress bitmaps.
+    """
+
+    def build() -> DominanceLattice:
+        templates: Sequence[CompiledTemplate] = weight_table(game, include_difficult, include_time_consuming).templates
+        return DominanceLattice(list(templates), POINTS.get(game.name, lambda label, values: None))
+
+    key: Hashable = (options_fingerprint(game), include_difficult, include_time_consuming)
+    return _lattices.get(key, build)
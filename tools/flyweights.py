@@ -0,0 +1,187 @@
+"""
+One shared, immutable game state per set of options, so many slots with the same options don't each hold a copy.
+
+A SharedGame is everything a slot's generation needs that only depends on its options: the constraint and objective
+templates, with their pools resolved into tuples once, and the cumulative template weights. A SlotGame pairs one
+with the slot's own Random, which is the only thing a slot keeps for itself. The memory used then grows with the
+number of different option sets rather than the number of slots.
+
+SlotGame.generate gives exactly the objectives the game itself would give for the same Random, like the reference
+path in compare_generation, without calling back into the templates: each pick is one bisect over the cumulative
+weights and one choice per placeholder from the pools resolved in the shared state.
+
+The states of the default option sets are pre-baked into baked_defaults.py (python -m tools.bake_defaults), so
+slots using the defaults don't build templates or pools at all, as long as the game file hasn't changed since.
+"""
+
+from __future__ import annotations
+
+import functools
+import sys
+
+from bisect import bisect
+
+from itertools import accumulate
+from random import Random
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple, Type
+
+from . import baked_defaults
+from .catalogs import DependencyCache
+from .implementations import make_game, options_fingerprint
+from .manifest import source_hash
+
+# How many shared states the registry keeps. Slots hold on to theirs, so eviction only costs a rebuild.
+MAX_SHARED: int = 1024
+
+_registry: DependencyCache = DependencyCache(MAX_SHARED)
+
+# (label, ((key, pool, count), ...)) of a template, with its pools resolved
+Plan = Tuple[str, Tuple[Tuple[str, Tuple[str, ...], int], ...]]
+
+
+def _frozen(template: Any, resolved: Dict[Any, Tuple[str, ...]]) -> Any:
+    # A copy of the template whose placeholders read from tuples resolved now, instead of calling back into the game.
+    # Many templates draw from the same method of the game, like Umamusume's races, so each is only called once.
+    data: Dict[str, Any] = dict()
+
+    for key, (collection, count) in template.data.items():
+        if collection not in resolved:
+            resolved[collection] = tuple(collection())
+
+        data[key] = ((lambda pool=resolved[collection]: pool), count)
+
+    return type(template)(
+        label=template.label,
+        data=data,
+        is_time_consuming=template.is_time_consuming,
+        is_difficult=template.is_difficult,
+        weight=template.weight,
+    )
+
+
+def _plan(template: Any) -> Plan:
+    return template.label, tuple((key, collection(), count) for key, (collection, count) in template.data.items())
+
+
+class SharedGame:
+    __slots__ = ("fingerprint", "name", "constraints", "templates", "cumulative", "plans")
+
+    def __init__(self, fingerprint: Hashable, name: str, constraints: Sequence[Any], templates: Sequence[Any]) -> None:
+        self.fingerprint: Hashable = fingerprint
+        self.name: str = name
+
+        self.constraints: Tuple[Any, ...] = tuple(constraints)
+        self.templates: Tuple[Any, ...] = tuple(templates)
+        self.cumulative: Tuple[int, ...] = tuple(accumulate(template.weight for template in self.templates))
+        self.plans: Tuple[Plan, ...] = tuple(_plan(template) for template in self.templates)
+
+    @classmethod
+    def from_game(cls, game: Any) -> SharedGame:
+        resolved: Dict[Any, Tuple[str, ...]] = dict()
+
+        return cls(
+            options_fingerprint(game),
+            game.name,
+            [_frozen(template, resolved) for template in game.optional_game_constraint_templates()],
+            [_frozen(template, resolved) for template in game.game_objective_templates()],
+        )
+
+
+def _baked_game(game: Any, fingerprint: Hashable) -> Optional[SharedGame]:
+    # The pre-baked state of a default option set, if this is one and it still matches the game file and catalogs
+    module_name: str = type(game).__module__.rsplit(".", 1)[-1]
+    baked: Optional[Dict[str, Any]] = baked_defaults.BAKED.get(module_name)
+
+    if baked is None or baked["fingerprint"] != fingerprint or not _baked_is_current(module_name):
+        return None
+
+    # Looked up through catalog_overrides, so an overlay that changes any of them also drops this state
+    module: Any = sys.modules[type(game).__module__]
+
+    if any(module.catalog_overrides.get(name) is not None for name in module.catalogs):
+        return None
+
+    template_cls: Type[Any] = module.GameObjectiveTemplate
+    pools: Tuple[Tuple[str, ...], ...] = baked["pools"]
+
+    def unpack(template: Tuple[Any, ...]) -> Any:
+        label, placeholders, is_time_consuming, is_difficult, weight = template
+
+        return template_cls(
+            label=label,
+            data={key: ((lambda pool=pools[pool_index]: pool), count) for key, pool_index, count in placeholders},
+            is_time_consuming=is_time_consuming,
+            is_difficult=is_difficult,
+            weight=weight,
+        )
+
+    return SharedGame(
+        fingerprint,
+        game.name,
+        [unpack(template) for template in baked["constraints"]],
+        [unpack(template) for template in baked["templates"]],
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _baked_is_current(module_name: str) -> bool:
+    return baked_defaults.BAKED[module_name]["source_sha256"] == source_hash(module_name)
+
+
+def shared_game(game: Any) -> SharedGame:
+    """
+    Returns the shared state for a game's options, building it from this game if they haven't been seen before.
+    """
+
+    fingerprint: Hashable = options_fingerprint(game)
+    return _registry.get(fingerprint, lambda: _baked_game(game, fingerprint) or SharedGame.from_game(game))
+
+
+class SlotGame:
+    """
+    A slot's view of a game: the shared state for its options, and its own Random.
+    """
+
+    __slots__ = ("shared", "random")
+
+    def __init__(self, shared: SharedGame, random: Random) -> None:
+        self.shared: SharedGame = shared
+        self.random: Random = random
+
+    @classmethod
+    def create(cls, game_cls: Type[Any], values: Mapping[str, Any], random: Optional[Random] = None) -> SlotGame:
+        return cls(shared_game(make_game(game_cls, values)), random or Random())
+
+    def generate(self, count: int) -> List[str]:
+        """
+        Picks an optional constraint, if the game has any, followed by count objectives.
+        """
+
+        objectives: List[str] = list()
+
+        if self.shared.constraints:
+            objectives.append(self.random.choice(self.shared.constraints).generate_game_objective(self.random))
+
+        if not self.shared.plans:
+            raise IndexError("There are no objective templates to pick from")
+
+        # Each step draws from the Random exactly like the reference: random.choices with cum_weights is a bisect of
+        # random() * total, and random.sample(pool, 1) and random.choice(pool) both take pool[_randbelow(len(pool))]
+        cumulative: Tuple[int, ...] = self.shared.cumulative
+        total: float = float(cumulative[-1])
+        last: int = len(cumulative) - 1
+
+        for _ in range(count):
+            objective, placeholders = self.shared.plans[bisect(cumulative, self.random.random() * total, 0, last)]
+
+            for key, pool, draws in placeholders:
+                value: str = self.random.choice(pool) if draws == 1 else ", ".join(self.random.sample(pool, draws))
+                objective = objective.replace(key, value)
+
+            objectives.append(objective)
+
+        return objectives
+
+
+def flyweight_objectives(game: Any, seed: int, count: int) -> List[str]:
+    return SlotGame(shared_game(game), Random(seed)).generate(count)
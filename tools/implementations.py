@@ -0,0 +1,297 @@
+"""
+Loads the implementations in this repository so the tools can work with them.
+
+If Archipelago can be imported (run from an Archipelago checkout, or point ARCHIPELAGO_PATH at one), the game files
+are loaded against the real Keymaster's Keep base classes. Otherwise small stand-ins for Options, Game,
+GameObjectiveTemplate and KeymastersKeepGamePlatforms are installed first, which is enough to build templates and
+resolve options offline.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import enum
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import types
+import typing
+
+from pathlib import Path
+from random import Random
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type
+
+REPOSITORY: Path = Path(__file__).resolve().parent.parent
+
+# Module name -> Game subclass defined in it
+IMPLEMENTATIONS: Dict[str, str] = {
+    "bloons_td_6": "BloonsTD6Game",
+    "umamusume_pretty_derby": "UmamusumePrettyDerbyGame",
+}
+
+_modules: Dict[str, types.ModuleType] = dict()
+_loading: threading.Lock = threading.Lock()
+
+
+def _archipelago_package() -> Optional[str]:
+    archipelago_path: Optional[str] = os.environ.get("ARCHIPELAGO_PATH")
+
+    if archipelago_path and archipelago_path not in sys.path:
+        sys.path.insert(0, archipelago_path)
+
+    try:
+        importlib.import_module("worlds.keymasters_keep.game")
+    except ImportError:
+        return None
+
+    return "worlds.keymasters_keep"
+
+
+def _install_stand_ins() -> str:
+    package: str = "keymasters_keep"
+
+    if package in sys.modules:
+        return package
+
+    options = types.ModuleType("Options")
+
+    class Option:
+        default: Any = 0
+        display_name: str = ""
+
+        def __init__(self, value: Any) -> None:
+            self.value = value
+
+        @classmethod
+        def from_any(cls, data: Any) -> Option:
+            return cls(data)
+
+    class Toggle(Option):
+        default = 0
+
+        @classmethod
+        def from_any(cls, data: Any) -> Toggle:
+            if isinstance(data, str):
+                if data.lower() not in ("true", "false", "on", "off", "1", "0"):
+                    raise ValueError(f"{data} is not a valid value for {cls.__name__}")
+
+                return cls(int(data.lower() in ("true", "on", "1")))
+
+            return cls(int(bool(data)))
+
+    class DefaultOnToggle(Toggle):
+        default = 1
+
+    class OptionSet(Option):
+        default: Any = frozenset()
+        valid_keys: Any = frozenset()
+
+        @classmethod
+        def from_any(cls, data: Any) -> OptionSet:
+            if isinstance(data, str) or not isinstance(data, typing.Iterable):
+                raise ValueError(f"{cls.__name__} needs a list of values, not {data!r}")
+
+            return cls(set(data))
+
+    class OptionList(Option):
+        default: Any = ()
+
+        @classmethod
+        def from_any(cls, data: Any) -> OptionList:
+            if isinstance(data, str) or not isinstance(data, typing.Iterable):
+                raise ValueError(f"{cls.__name__} needs a list of values, not {data!r}")
+
+            return cls(list(data))
+
+    for option_cls in (Option, Toggle, DefaultOnToggle, OptionSet, OptionList):
+        option_cls.__module__ = "Options"
+        setattr(options, option_cls.__name__, option_cls)
+
+    game_objective_template = types.ModuleType(f"{package}.game_objective_template")
+
+    class GameObjectiveTemplate:
+        def __init__(
+            self,
+            label: str,
+            data: Optional[Dict[str, Any]] = None,
+            is_time_consuming: bool = False,
+            is_difficult: bool = False,
+            weight: int = 1,
+        ) -> None:
+            self.label = label
+            self.data = data or dict()
+            self.is_time_consuming = is_time_consuming
+            self.is_difficult = is_difficult
+            self.weight = weight
+
+        def generate_game_objective(self, random: Random) -> str:
+            objective: str = self.label
+
+            for key, (collection, count) in self.data.items():
+                objective = objective.replace(key, ", ".join(random.sample(collection(), count)))
+
+            return objective
+
+    game_objective_template.GameObjectiveTemplate = GameObjectiveTemplate
+
+    game = types.ModuleType(f"{package}.game")
+
+    class Game:
+        name: str = ""
+        platform: Any = None
+        platforms_other: Any = None
+        is_adult_only_or_unrated: bool = True
+        options_cls: Any = None
+
+        def __init__(self, random: Optional[Random] = None, archipelago_options: Any = None) -> None:
+            self.random = random or Random()
+            self.archipelago_options = archipelago_options
+
+        def optional_game_constraint_templates(self) -> List[Any]:
+            return list()
+
+        def game_objective_templates(self) -> List[Any]:
+            return list()
+
+    game.Game = Game
+
+    enums = types.ModuleType(f"{package}.enums")
+    enums.KeymastersKeepGamePlatforms = enum.Enum(
+        "KeymastersKeepGamePlatforms", "PC AND IOS PS4 PS5 XONE XSX SW"
+    )
+
+    root = types.ModuleType(package)
+    root.__path__ = list()
+
+    games = types.ModuleType(f"{package}.games")
+    games.__path__ = list()
+
+    sys.modules.update({
+        "Options": options,
+        package: root,
+        f"{package}.games": games,
+        f"{package}.game": game,
+        f"{package}.game_objective_template": game_objective_template,
+        f"{package}.enums": enums,
+    })
+
+    return package
+
+
+def load_implementations(offline: bool = False) -> Dict[str, types.ModuleType]:
+    """
+    Imports every implementation in the repository (once per process), keyed by module name.
+
+    With offline set, the stand-ins are used even if Archipelago could be imported. It only has an effect on the
+    first call in a process.
+    """
+
+    if _modules:
+        return _modules
+
+    with _loading:
+        if _modules:
+            return _modules
+
+        package: str = (not offline and _archipelago_package()) or _install_stand_ins()
+        modules: Dict[str, types.ModuleType] = dict()
+
+        for module_name in IMPLEMENTATIONS:
+            spec = importlib.util.spec_from_file_location(
+                f"{package}.games.{module_name}", REPOSITORY / f"{module_name}.py"
+            )
+
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module
+            spec.loader.exec_module(module)
+
+            modules[module_name] = module
+
+        # Profiling (see profiling.py) tags the game classes before any other thread can use them
+        from .profiling import install_from_environment
+
+        install_from_environment(modules)
+
+        # Only filled in once every module has loaded, so other threads never see some of them
+        _modules.update(modules)
+
+    return _modules
+
+
+def game_classes() -> Dict[str, Type[Any]]:
+    """
+    Returns every Game subclass in the repository, keyed by the game's name.
+    """
+
+    classes: Dict[str, Type[Any]] = dict()
+
+    for module_name, module in load_implementations().items():
+        game_cls: Type[Any] = getattr(module, IMPLEMENTATIONS[module_name])
+        classes[game_cls.name] = game_cls
+
+    return classes
+
+
+def option_classes(game_cls: Type[Any]) -> Dict[str, Type[Any]]:
+    """
+    Returns the option name -> option class mapping declared by a game's options dataclass.
+    """
+
+    hints: Dict[str, Any] = typing.get_type_hints(game_cls.options_cls)
+    return {field.name: hints[field.name] for field in dataclasses.fields(game_cls.options_cls)}
+
+
+def resolve_options(game_cls: Type[Any], values: Mapping[str, Any]) -> Any:
+    """
+    Resolves raw YAML values into the game's option classes, using each option's default where a value is missing.
+
+    Raises ValueError if a value can't be turned into its option.
+    """
+
+    resolved: Dict[str, Any] = dict()
+
+    for option_name, option_cls in option_classes(game_cls).items():
+        value: Any = values.get(option_name, option_cls.default)
+
+        try:
+            resolved[option_name] = option_cls.from_any(value)
+        except Exception as error:
+            raise ValueError(f"{option_name}: {error}") from error
+
+    return game_cls.options_cls(**resolved)
+
+
+def make_game(game_cls: Type[Any], values: Mapping[str, Any], random: Optional[Random] = None) -> Any:
+    """
+    Creates a game with its options resolved from raw YAML values, the way a slot would see it.
+    """
+
+    game: Any = game_cls()
+
+    game.random = random or Random()
+    game.archipelago_options = resolve_options(game_cls, values)
+
+    return game
+
+
+def options_fingerprint(game: Any) -> Tuple[Any, ...]:
+    """
+    Returns a hashable snapshot of a game's resolved option values. Games with equal fingerprints generate from
+    exactly the same templates and pools.
+    """
+
+    values: List[Tuple[str, Any]] = list()
+
+    for field in dataclasses.fields(game.archipelago_options):
+        value: Any = getattr(game.archipelago_options, field.name).value
+
+        if isinstance(value, (set, frozenset)):
+            value = tuple(sorted(value))
+        elif isinstance(value, list):
+            value = tuple(value)
+
+        values.append((field.name, value))
+
+    return (game.name, *values)
@@ -0,0 +1,84 @@
+"""
+One shared copy of each rendered objective, however many slots it appears in.
+
+An ObjectiveTable keys rendered objectives by (template id, combination index), the combination index standing for
+the template's placeholder values (see combinations.py). Templates with the same label and pools get the same id,
+even when they were compiled separately for different option sets, so "Complete Monkey Meadow on Standard Easy" is
+only rendered and stored once across a whole multiworld. Ids are looked up by a digest of the label and pools, so
+remembering a template costs a few dozen bytes rather than a copy of its pools.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+import threading
+
+from typing import Dict, Optional, Tuple
+
+from .combinations import CompiledTemplate
+
+# Past this many objectives the table stops growing, and new ones are rendered without being kept
+MAX_OBJECTIVES: int = 1 << 20
+# Past this many templates, new ones get an id of their own without being remembered, so they aren't shared
+MAX_TEMPLATES: int = 1 << 16
+
+_template_ids: Dict[bytes, int] = dict()
+_next_id: int = 0
+_lock: threading.Lock = threading.Lock()
+
+
+def template_digest(template: CompiledTemplate) -> bytes:
+    content: str = json.dumps([template.label, template.pools], separators=(",", ":"))
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+def template_id(template: CompiledTemplate) -> int:
+    """
+    Returns the id of a template's label and pools, the same for every CompiledTemplate with equal ones.
+    """
+
+    global _next_id
+
+    if template.template_id is None:
+        key: bytes = template_digest(template)
+
+        with _lock:
+            known: Optional[int] = _template_ids.get(key)
+
+            if known is None:
+                known = _next_id
+                _next_id += 1
+
+                if len(_template_ids) < MAX_TEMPLATES:
+                    _template_ids[key] = known
+
+            template.template_id = known
+
+    return template.template_id
+
+
+class ObjectiveTable:
+    def __init__(self, max_objectives: int = MAX_OBJECTIVES) -> None:
+        self.max_objectives: int = max_objectives
+        self._objectives: Dict[Tuple[int, int], str] = dict()
+
+    def render(self, template: CompiledTemplate, index: int) -> str:
+        key: Tuple[int, int] = (template_id(template), index)
+        objective: Optional[str] = self._objectives.get(key)
+
+        if objective is None:
+            objective = sys.intern(template.render(index))
+
+            if len(self._objectives) < self.max_objectives:
+                objective = self._objectives.setdefault(key, objective)
+
+        return objective
+
+    def __len__(self) -> int:
+        return len(self._objectives)
+
+
+# The table shared by every slot in the process
+objectives: ObjectiveTable = ObjectiveTable()
@@ -0,0 +1,206 @@
+"""
+Lints player YAMLs for the games in this repository before they go into a generation.
+
+Each YAML document that plays Keymaster's Keep has its options for these games resolved into the option classes
+of the implementations, and then checked with the games' option_problems. Weighted options are expanded, so a
+problem that only shows up on some rolls is still reported, along with the values that cause it.
+
+    python -m tools.lint_yamls players/ --output report.json
+
+The report is JSON, and the exit code is 1 if any file has an error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+import yaml
+
+from .implementations import game_classes, load_implementations, make_game, option_classes
+
+GAME_KEY: str = "Keymaster's Keep"
+
+# Weighted options are expanded into every combination of their values, up to this many per game
+MAX_ROLLS: int = 256
+
+
+def _choices(option_cls: Type[Any], value: Any) -> List[Any]:
+    if isinstance(value, dict) and not hasattr(option_cls, "valid_keys"):
+        return [choice for choice, weight in value.items() if weight]
+
+    if isinstance(value, str) and value.startswith("random") and hasattr(option_cls, "default"):
+        if isinstance(option_cls.default, int):
+            return [True, False]
+
+    return [value]
+
+
+def _is_selected(game_cls: Type[Any], section: Dict[str, Any], prefix: str) -> bool:
+    for key, value in section.items():
+        if key.startswith(prefix):
+            return True
+
+        if key.endswith("game_selection") and isinstance(value, (list, dict)) and game_cls.name in value:
+            return True
+
+    return False
+
+
+def lint_section(section: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Lints the Keymaster's Keep options of one YAML document, returning its problems.
+    """
+
+    problems: List[Dict[str, Any]] = list()
+
+    for game_name, game_cls in game_classes().items():
+        prefix: str = game_cls.__module__.rsplit(".", 1)[-1] + "_"
+
+        if not _is_selected(game_cls, section, prefix):
+            continue
+
+        options: Dict[str, Type[Any]] = option_classes(game_cls)
+
+        for key in section:
+            if key.startswith(prefix) and key not in options:
+                problems.append({"game": game_name, "level": "warning", "message": f"Unknown option {key}."})
+
+        weighted: List[Tuple[str, List[Any]]] = list()
+
+        for option_name, option_cls in options.items():
+            if option_name not in section:
+                continue
+
+            choices: List[Any] = _choices(option_cls, section[option_name])
+            valid_keys: Any = getattr(option_cls, "valid_keys", None)
+
+            for choice in choices:
+                if valid_keys and isinstance(choice, list):
+                    for invalid in sorted(set(choice) - set(valid_keys)):
+                        problems.append({
+                            "game": game_name,
+                            "level": "error",
+                            "message": f"{option_name} has '{invalid}', which isn't one of {', '.join(valid_keys)}.",
+                        })
+
+            if len(choices) > 1:
+                weighted.append((option_name, choices))
+
+        seen: Set[Tuple[str, str]] = set()
+
+        for rolled in itertools.islice(itertools.product(*(choices for _, choices in weighted)), MAX_ROLLS):
+            values: Dict[str, Any] = dict(section)
+            values.update(zip((option_name for option_name, _ in weighted), rolled))
+
+            try:
+                game_problems: List[Tuple[str, str]] = make_game(game_cls, values).option_problems()
+            except ValueError as error:
+                game_problems = [("error", str(error))]
+
+            for level, message in game_problems:
+                if (level, message) in seen:
+                    continue
+
+                seen.add((level, message))
+                problem: Dict[str, Any] = {"game": game_name, "level": level, "message": message}
+
+                if weighted:
+                    problem["when"] = dict(zip((option_name for option_name, _ in weighted), rolled))
+
+                problems.append(problem)
+
+    return problems
+
+
+def lint_file(path: str) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"path": path, "problems": list()}
+
+    try:
+        with open(path, encoding="utf-8-sig") as file:
+            documents: List[Any] = [document for document in yaml.safe_load_all(file) if document]
+    except (OSError, yaml.YAMLError) as error:
+        result["problems"].append({"game": None, "level": "error", "message": f"Could not read file: {error}"})
+        return result
+
+    for document in documents:
+        if not isinstance(document, dict):
+            continue
+
+        section: Any = document.get(GAME_KEY)
+
+        if not isinstance(section, dict):
+            continue
+
+        for problem in lint_section(section):
+            problem["player"] = document.get("name")
+            result["problems"].append(problem)
+
+    return result
+
+
+def lint_files(paths: Iterable[str], workers: Optional[int] = None) -> Dict[str, Any]:
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(paths) < 2:
+        results: List[Dict[str, Any]] = [lint_file(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=load_implementations) as executor:
+            chunksize: int = max(1, len(paths) // (workers * 4))
+            results = list(executor.map(lint_file, paths, chunksize=chunksize))
+
+    levels: List[str] = [problem["level"] for result in results for problem in result["problems"]]
+
+    return {
+        "files": results,
+        "summary": {
+            "files": len(results),
+            "errors": levels.count("error"),
+            "warnings": levels.count("warning"),
+        },
+    }
+
+
+def _expand(paths: Iterable[str]) -> List[str]:
+    expanded: List[str] = list()
+
+    for path in map(Path, paths):
+        if path.is_dir():
+            expanded.extend(str(child) for child in sorted(path.rglob("*")) if child.suffix in (".yaml", ".yml"))
+        else:
+            expanded.append(str(path))
+
+    return expanded
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="YAML files, or folders to search for them")
+    parser.add_argument("--workers", type=int, default=None, help="processes to lint with (default: one per CPU)")
+    parser.add_argument("--output", default=None, help="file to write the JSON report to (default: stdout)")
+
+    args = parser.parse_args(arguments)
+
+    load_implementations()
+    report: Dict[str, Any] = lint_files(_expand(args.paths), args.workers)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    return 1 if report["summary"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
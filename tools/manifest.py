@@ -0,0 +1,139 @@
+"""
+A static manifest of the implementations, so hosts can list the games and their options without importing them.
+
+    python -m tools.manifest            writes manifest.json
+    python -m tools.manifest --check    exits with 1 if manifest.json is out of date
+
+Each entry records the SHA-256 of its game file. is_stale only hashes the file, so a host can check an entry is
+still current without importing the implementation, and only import it once a slot actually plays the game.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import inspect
+import json
+import sys
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+from .implementations import IMPLEMENTATIONS, REPOSITORY, load_implementations, option_classes
+
+MANIFEST_PATH: Path = REPOSITORY / "manifest.json"
+MANIFEST_VERSION: int = 1
+
+
+def source_hash(module_name: str) -> str:
+    return hashlib.sha256((REPOSITORY / f"{module_name}.py").read_bytes()).hexdigest()
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+
+    if isinstance(value, (list, tuple)):
+        return list(value)
+
+    return value
+
+
+def _option_type(option_cls: Type[Any]) -> str:
+    # The closest class Archipelago itself defines, e.g. Toggle or OptionSet
+    for base in option_cls.__mro__:
+        if base.__module__ == "Options":
+            return base.__name__
+
+    return option_cls.__name__
+
+
+def _platform(platform: Any) -> Optional[str]:
+    return getattr(platform, "name", platform)
+
+
+def build_entry(module_name: str) -> Dict[str, Any]:
+    module = load_implementations()[module_name]
+    game_cls: Type[Any] = getattr(module, IMPLEMENTATIONS[module_name])
+
+    options: List[Dict[str, Any]] = list()
+
+    for option_name, option_cls in option_classes(game_cls).items():
+        option: Dict[str, Any] = {
+            "name": option_name,
+            "class": option_cls.__name__,
+            "type": _option_type(option_cls),
+            "display_name": getattr(option_cls, "display_name", option_name),
+            "default": _jsonable(option_cls.default),
+            "description": inspect.cleandoc(option_cls.__doc__ or ""),
+        }
+
+        if getattr(option_cls, "valid_keys", None):
+            option["valid_keys"] = _jsonable(option_cls.valid_keys)
+
+        options.append(option)
+
+    return {
+        "module": module_name,
+        "class": game_cls.__name__,
+        "source_sha256": source_hash(module_name),
+        "name": game_cls.name,
+        "platform": _platform(game_cls.platform),
+        "platforms_other": [_platform(platform) for platform in game_cls.platforms_other or list()],
+        "is_adult_only_or_unrated": game_cls.is_adult_only_or_unrated,
+        "options": options,
+    }
+
+
+def build_manifest() -> Dict[str, Any]:
+    return {
+        "version": MANIFEST_VERSION,
+        "games": [build_entry(module_name) for module_name in IMPLEMENTATIONS],
+    }
+
+
+def read_manifest(path: Path = MANIFEST_PATH) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def is_stale(entry: Dict[str, Any]) -> bool:
+    """
+    Whether a manifest entry no longer matches its game file. Doesn't import anything.
+    """
+
+    return entry["source_sha256"] != source_hash(entry["module"])
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="only check that the manifest is up to date")
+    parser.add_argument("--output", type=Path, default=MANIFEST_PATH, help="where the manifest lives")
+
+    args = parser.parse_args(arguments)
+
+    if args.check:
+        try:
+            manifest: Dict[str, Any] = read_manifest(args.output)
+        except (OSError, ValueError):
+            print(f"{args.output} is missing or unreadable", file=sys.stderr)
+            return 1
+
+        modules: List[str] = [entry["module"] for entry in manifest.get("games", list())]
+        stale: List[str] = [entry["module"] for entry in manifest.get("games", list()) if is_stale(entry)]
+        stale.extend(module_name for module_name in IMPLEMENTATIONS if module_name not in modules)
+
+        for module_name in stale:
+            print(f"{module_name} has changed since {args.output.name} was written", file=sys.stderr)
+
+        return 1 if stale else 0
+
+    with open(args.output, "w", encoding="utf-8", newline="\n") as file:
+        json.dump(build_manifest(), file, indent=2)
+        file.write("\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Bloons TD 6 progress as a grid of medals, one row per mode and one column per map.
+
+Each row is an int used as a bitmap over every map of every map type, so whole rows and columns are handled with
+a few bitwise operations instead of loops over cells:
+
+- done_on_every(modes) ANDs the rows of the modes, giving the maps that have all of them.
+- missing(mode, map_type) masks a row's complement with the map type's columns.
+- column(map) gathers one bit of every row, giving the modes a map has.
+
+medal_set_exclusions uses these to find the medal set objectives (bloons_td_6_include_medal_sets) that a player's
+grid already covers. progress.compile_progress calls it for the "maps" entries of a progress file.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .combinations import CompiledTemplate
+
+MEDAL_SET_PREFIX: str = "Complete MAP on every one of: "
+MEDAL_COUNT_KEY: str = "MEDALCOUNT"
+
+
+class MedalGrid:
+    __slots__ = ("maps", "modes", "map_types", "difficulties", "rows", "_map_bits", "_mode_rows")
+
+    def __init__(self, map_types: Dict[str, Sequence[str]], difficulties: Dict[str, Sequence[str]]) -> None:
+        self.maps: Tuple[str, ...] = tuple(dict.fromkeys(m for maps in map_types.values() for m in maps))
+        self.modes: Tuple[str, ...] = tuple(dict.fromkeys(m for modes in difficulties.values() for m in modes))
+
+        self._map_bits: Dict[str, int] = {map_name: i for i, map_name in enumerate(self.maps)}
+        self._mode_rows: Dict[str, int] = {mode: i for i, mode in enumerate(self.modes)}
+
+        # Columns of each map type, and rows of each difficulty
+        self.map_types: Dict[str, int] = {name: self._map_mask(maps) for name, maps in map_types.items()}
+        self.difficulties: Dict[str, int] = {
+            name: sum(1 << self._mode_rows[mode] for mode in modes) for name, modes in difficulties.items()
+        }
+
+        self.rows: List[int] = [0] * len(self.modes)
+
+    @classmethod
+    def for_game(cls, game: Any) -> MedalGrid:
+        """
+        An empty grid over every map and mode of a BloonsTD6Game, whatever its options include.
+        """
+
+        return cls(
+            {map_type: maps for map_type, _, maps in game.map_types()},
+            {"Easy": game.easy_modes(), "Medium": game.medium_modes(), "Hard": game.hard_modes()},
+        )
+
+    def _map_mask(self, maps: Iterable[str]) -> int:
+        return sum(1 << self._map_bits[map_name] for map_name in set(maps) if map_name in self._map_bits)
+
+    def mark(self, map_name: str, mode: str) -> bool:
+        """
+        Records a medal, returning False if the map or mode isn't on the grid.
+        """
+
+        if map_name not in self._map_bits or mode not in self._mode_rows:
+            return False
+
+        self.rows[self._mode_rows[mode]] |= 1 << self._map_bits[map_name]
+
+        return True
+
+    def row(self, mode: str) -> int:
+        return self.rows[self._mode_rows[mode]] if mode in self._mode_rows else 0
+
+    def column(self, map_name: str) -> int:
+        """
+        Returns the modes a map has medals in, as a bitmap over modes.
+        """
+
+        bit: Optional[int] = self._map_bits.get(map_name)
+
+        if bit is None:
+            return 0
+
+        return sum(1 << i for i, row in enumerate(self.rows) if row >> bit & 1)
+
+    def done_on_every(self, modes: Iterable[str]) -> int:
+        """
+        Returns the maps that have medals in every one of the modes.
+        """
+
+        done: int = (1 << len(self.maps)) - 1
+
+        for mode in modes:
+            done &= self.row(mode)
+
+        return done
+
+    def missing(self, mode: str, map_type: str) -> int:
+        return self.map_types.get(map_type, 0) & ~self.row(mode)
+
+    def earned(self, mode: str, map_type: str) -> int:
+        return (self.map_types.get(map_type, 0) & self.row(mode)).bit_count()
+
+    def maps_in(self, mask: int) -> List[str]:
+        return [map_name for i, map_name in enumerate(self.maps) if mask >> i & 1]
+
+    def __len__(self) -> int:
+        # How many medals have been earned
+        return sum(row.bit_count() for row in self.rows)
+
+
+def medal_set_exclusions(templates: Sequence[CompiledTemplate], grid: MedalGrid) -> List[int]:
+    """
+    Returns, per template, the bitmap of medal set combinations the grid already covers. Other templates get 0.
+    """
+
+    masks: List[int] = [0] * len(templates)
+
+    for template_index, template in enumerate(templates):
+        if template.label.startswith(MEDAL_SET_PREFIX) and template.keys == ("MAP",):
+            done: Set[str] = set(grid.maps_in(grid.done_on_every(template.label[len(MEDAL_SET_PREFIX):].split(", "))))
+
+            for value_index, map_name in enumerate(template.pools[0]):
+                if map_name in done:
+                    masks[template_index] |= 1 << value_index
+        elif MEDAL_COUNT_KEY in template.keys:
+            # Only a handful of modes, counts and map types, so every combination is checked against the grid
+            for index in range(template.count):
+                values: Dict[str, str] = {
+                    key: pool[value_index]
+                    for key, pool, value_index in zip(template.keys, template.pools, template.value_indices(index))
+                }
+
+                mode: str = next(value for key, value in values.items() if key.endswith("MODE"))
+
+                if grid.earned(mode, values["MAPTYPE"]) >= int(values[MEDAL_COUNT_KEY]):
+                    masks[template_index] |= 1 << index
+
+    return masks
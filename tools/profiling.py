@@ -0,0 +1,321 @@
+"""
+A sampling profiler that splits a slot's generation time into phases, per game, for flame graphs.
+
+Set KMK_PROFILE to a folder and every tool that loads the implementations profiles itself:
+
+    KMK_PROFILE=profiles python -m tools.stress_keeps --slots 1000
+    flamegraph.pl "profiles/Bloons TD 6.pools.folded" > pools.svg
+
+The game classes are tagged when they're loaded, so the game files themselves don't change:
+
+- options: the include_* properties and included_* methods
+- templates: game_objective_templates and optional_game_constraint_templates
+- pools: every other list the game builds, like maps(), races() and trainees()
+- expansion: placeholder draws and rendering in streams.py
+
+Every KMK_PROFILE_INTERVAL seconds of CPU time (0.001 by default), a SIGPROF timer samples the stack of every
+thread inside a tagged phase, and counts it under that thread's innermost phase. When the process exits, the counts
+are written in collapsed-stack format, one file per game and phase. Any .folded files already in the folder are
+removed when sampling starts, so only this run's are left. Slots on the default options come from baked data (see
+flyweights.py), so they spend next to no time in the game classes.
+
+Worker processes, like the pool of lint_yamls, leave through os._exit and never run atexit hooks. They write their
+counts from a multiprocessing finalizer instead, to files named with their PID, and the main process adds those
+into its own files when it exits.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import multiprocessing
+import multiprocessing.util
+import os
+import signal
+import sys
+import threading
+import types
+
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .implementations import IMPLEMENTATIONS
+
+PROFILE_VARIABLE: str = "KMK_PROFILE"
+INTERVAL_VARIABLE: str = "KMK_PROFILE_INTERVAL"
+
+PHASES: Tuple[str, ...] = ("options", "templates", "pools", "expansion")
+
+# Game class members that are none of the phases, or only format a label
+UNTAGGED: Tuple[str, ...] = ("option_problems", "constraint_conflicts", "medal_set_label")
+
+# (game name, phase)
+Tag = Tuple[str, str]
+
+_local: threading.local = threading.local()
+# Thread id -> that thread's stack of tags, read by the sampler
+_tags: Dict[int, List[Tag]] = dict()
+# (game name, phase) -> collapsed stack -> samples
+_samples: Dict[Tag, Counter] = dict()
+
+_installed: bool = False
+# Kept here so the after-fork hook isn't collected
+_forked: Optional[Callable[[], None]] = None
+
+
+def _thread_tags() -> List[Tag]:
+    tags: Optional[List[Tag]] = getattr(_local, "tags", None)
+
+    if tags is None:
+        tags = list()
+        _local.tags = tags
+        _tags[threading.get_ident()] = tags
+
+    return tags
+
+
+def _tagged(function: Callable[..., Any], tag: Callable[[Tuple[Any, ...]], Tag]) -> Callable[..., Any]:
+    @functools.wraps(function)
+    def tagged(*args: Any, **kwargs: Any) -> Any:
+        tags: List[Tag] = _thread_tags()
+        tags.append(tag(args))
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            tags.pop()
+
+    return tagged
+
+
+def phase_of(name: str) -> Optional[str]:
+    """
+    Returns the phase a member of a game class belongs to, or None if it isn't tagged.
+    """
+
+    if name.startswith("_") or name in UNTAGGED:
+        return None
+
+    if name.startswith("include_") or name.startswith("included_"):
+        return "options"
+
+    if name.endswith("_templates"):
+        return "templates"
+
+    return "pools"
+
+
+def _tag_game(game_cls: type) -> None:
+    for name, member in list(vars(game_cls).items()):
+        phase: Optional[str] = phase_of(name)
+
+        if phase is None:
+            continue
+
+        tag: Tag = (game_cls.name, phase)
+
+        def fixed(args: Tuple[Any, ...], tag: Tag = tag) -> Tag:
+            return tag
+
+        if isinstance(member, property) and member.fget is not None:
+            setattr(game_cls, name, property(_tagged(member.fget, fixed), member.fset, member.fdel, member.__doc__))
+        elif isinstance(member, staticmethod):
+            setattr(game_cls, name, staticmethod(_tagged(member.__func__, fixed)))
+        elif isinstance(member, types.FunctionType):
+            setattr(game_cls, name, _tagged(member, fixed))
+
+
+def _tag_expansion() -> None:
+    from .streams import ObjectiveStreams, PlaceholderBags
+
+    def expansion(args: Tuple[Any, ...]) -> Tag:
+        return args[0].game_name, "expansion"
+
+    ObjectiveStreams.draw = _tagged(ObjectiveStreams.draw, expansion)
+    ObjectiveStreams.render = _tagged(ObjectiveStreams.render, expansion)
+    PlaceholderBags.draw_unused = _tagged(PlaceholderBags.draw_unused, expansion)
+
+
+def collapse(frame: Optional[types.FrameType]) -> str:
+    """
+    Returns a stack as root;...;leaf, leaving out this module's wrappers.
+    """
+
+    names: List[str] = list()
+
+    while frame is not None:
+        code: types.CodeType = frame.f_code
+
+        if code.co_filename != __file__:
+            names.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+
+        frame = frame.f_back
+
+    return ";".join(reversed(names))
+
+
+def _sample() -> None:
+    frames: Dict[int, types.FrameType] = sys._current_frames()
+
+    for thread_id, tags in list(_tags.items()):
+        try:
+            tag: Tag = tags[-1]
+        except IndexError:
+            continue
+
+        frame: Optional[types.FrameType] = frames.get(thread_id)
+
+        if frame is not None:
+            _samples.setdefault(tag, Counter())[collapse(frame)] += 1
+
+
+def _start_timer(interval: float) -> Callable[[], None]:
+    # SIGPROF fires every interval of CPU time and interrupts the main thread wherever it is. A sampling thread only
+    # gets the GIL when the other threads let go of it, mostly while they wait on I/O, so it would hardly ever see
+    # them inside a phase.
+    signal.signal(signal.SIGPROF, lambda signum, frame: _sample())
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+
+    def stop() -> None:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+
+    return stop
+
+
+def _start_thread(interval: float) -> Callable[[], None]:
+    # Without SIGPROF (Windows, or installed off the main thread), a thread samples instead, less evenly
+    stopping: threading.Event = threading.Event()
+
+    def run() -> None:
+        while not stopping.wait(interval):
+            _sample()
+
+    sampler: threading.Thread = threading.Thread(target=run, name="kmk-profiler", daemon=True)
+    sampler.start()
+
+    def stop() -> None:
+        stopping.set()
+        sampler.join()
+
+    return stop
+
+
+def _clear_profiles(directory: Path) -> None:
+    # Only the main process clears, before any worker of this run has written its files
+    for path in directory.glob("*.folded"):
+        path.unlink()
+
+
+def _merge_workers(directory: Path) -> None:
+    # Adds in the files that worker processes wrote during this run, named "{game}.{phase}.{pid}.folded", then
+    # removes them
+    for path in directory.glob("*.folded"):
+        parts: List[str] = path.stem.rsplit(".", 2)
+
+        if len(parts) != 3 or parts[1] not in PHASES or not parts[2].isdigit():
+            continue
+
+        stacks: Counter = _samples.setdefault((parts[0], parts[1]), Counter())
+
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                stacks[stack] += int(count)
+
+        path.unlink()
+
+
+def write_profiles(directory: Path, suffix: str = "") -> List[Path]:
+    """
+    Writes the samples so far, one collapsed-stack file per game and phase, and returns the files written.
+    """
+
+    directory.mkdir(parents=True, exist_ok=True)
+    written: List[Path] = list()
+
+    for (game_name, phase), stacks in sorted(_samples.items()):
+        path: Path = directory / f"{game_name}.{phase}{suffix}.folded"
+
+        with open(path, "w", encoding="utf-8", newline="\n") as file:
+            for stack, count in sorted(stacks.items()):
+                file.write(f"{stack} {count}\n")
+
+        written.append(path)
+
+    return written
+
+
+def install(modules: Dict[str, types.ModuleType], directory: Path, interval: float = 0.001) -> None:
+    """
+    Tags the phases of the loaded game classes and starts sampling, writing the profiles to directory on exit,
+    including from worker processes.
+    """
+
+    global _installed
+
+    if _installed:
+        return
+
+    _installed = True
+
+    for module_name, module in modules.items():
+        _tag_game(getattr(module, IMPLEMENTATIONS[module_name]))
+
+    _tag_expansion()
+
+    _start(directory, interval)
+
+    global _forked
+
+    def forked() -> None:
+        # A forked worker inherits the tagged classes and the parent's counts, but not its timer or sampler thread
+        _samples.clear()
+        _start(directory, interval)
+
+    # multiprocessing clears the finalizers of a forked worker before running these hooks, so the worker registers
+    # its own. The registry only holds the hook weakly.
+    _forked = forked
+    multiprocessing.util.register_after_fork(forked, lambda hook: hook())
+
+
+def _start(directory: Path, interval: float) -> None:
+    worker: bool = multiprocessing.parent_process() is not None
+    finished: bool = False
+
+    if not worker:
+        # Games and phases this run never samples would otherwise keep an earlier run's files
+        _clear_profiles(directory)
+
+    stop: Callable[[], None]
+
+    try:
+        stop = _start_timer(interval)
+    except (AttributeError, ValueError):
+        stop = _start_thread(interval)
+
+    def finish() -> None:
+        nonlocal finished
+
+        if finished:
+            return
+
+        finished = True
+        stop()
+
+        if worker:
+            write_profiles(directory, f".{os.getpid()}")
+        else:
+            _merge_workers(directory)
+            write_profiles(directory)
+
+    # Worker processes only run multiprocessing's finalizers on the way out, and the main process runs both
+    atexit.register(finish)
+    multiprocessing.util.Finalize(None, finish, exitpriority=0)
+
+
+def install_from_environment(modules: Dict[str, types.ModuleType]) -> None:
+    directory: Optional[str] = os.environ.get(PROFILE_VARIABLE)
+
+    if directory:
+        install(modules, Path(directory), float(os.environ.get(INTERVAL_VARIABLE, "0.001")))
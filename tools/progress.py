@@ -0,0 +1,236 @@
+"""
+Player progress, compiled into bitmaps of the objectives a player has already done.
+
+Progress is a JSON file of completed entries per game and kind:
+
+    {
+        "Bloons TD 6": {
+            "maps": [["Monkey Meadow", "CHIMPS"]],
+            "bosses": [["Lych", "Tier 3", "Logs"]],
+            "elite_bosses": [["Vortex", "Tier 1", "Cubism"]]
+        },
+        "Umamusume: Pretty Derby": {
+            "races": [["Tokyo Yushun (Japanese Derby)", "2nd"]],
+            "good_endings": [["Special Week (Normal)", "URA Finale"]],
+            "epithets": [["Special Week (Normal)"]]
+        }
+    }
+
+A race placement also covers every template asking for a lower one, so a 2nd in the Tokyo Yushun covers
+"Get at least 2nd" through "Get at least 5th" in it, but not "Win 1st".
+
+Names are checked against everything the game can ask for with every option on (see codex.py), so a misspelled
+map or race is an error instead of an entry that never matches. Trainees are any text in the options, so unknown
+ones are only warnings, like in option_problems.
+
+compile_progress turns the entries into one bitmap per template over its combination index (see combinations.py).
+Those can be passed to generate_objectives as excluded, so completed objectives are never drawn, or to
+RerollIndex.exclude. Bloons TD 6 medal sets are checked against a medal grid of the completed maps (medal_grid.py).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple, Type, Union
+
+from .catalogs import DependencyCache
+from .codex import codex_options
+from .combinations import CompiledTemplate
+from .implementations import game_classes, make_game
+from .medal_grid import MedalGrid, medal_set_exclusions
+from .weights import weight_table
+
+Entry = Tuple[str, ...]
+
+# Placeholder keys by what their values are, e.g. BEGINNERMAP and EXPERTMAP are both maps
+ROLES: Tuple[str, ...] = ("MAP", "MODE", "TIER", "BOSS", "RACE", "TRAINEE", "SCENARIO")
+
+# Roles whose values come from the player's options rather than the game file, so unknown ones are only warnings
+FREE_ROLES: Tuple[str, ...] = ("TRAINEE",)
+
+# Game name -> role -> every value any template can draw for it, dropped when an overlay changes a catalog
+_known: DependencyCache = DependencyCache(16)
+
+
+def _placement(value: Union[str, int]) -> int:
+    number: Optional[re.Match[str]] = re.match(r"\d+", str(value))
+
+    if number is None:
+        raise ValueError(f"'{value}' isn't a placement, like 1st or 3")
+
+    return int(number.group())
+
+
+def _placement_reached(label: str, extras: Entry) -> bool:
+    asked: Optional[re.Match[str]] = re.search(r"(\d+)(?:st|nd|rd|th) in RACE", label)
+    return asked is not None and _placement(extras[0]) <= int(asked.group(1))
+
+
+# Game name -> kind -> (the role of each entry field, whether the entry completes a template with this label).
+# Fields past the roles are only passed to the check, like the placement of a race.
+PROGRESS_KINDS: Dict[str, Dict[str, Tuple[Tuple[str, ...], Callable[[str, Entry], bool]]]] = {
+    "Bloons TD 6": {
+        "maps": (("MAP", "MODE"), lambda label, extras: label.startswith("Complete ")),
+        "bosses": (("BOSS", "TIER", "MAP"), lambda label, extras: " Elite " not in label),
+        "elite_bosses": (("BOSS", "TIER", "MAP"), lambda label, extras: " Elite " in label),
+    },
+    "Umamusume: Pretty Derby": {
+        "races": (("RACE",), _placement_reached),
+        "good_endings": (("TRAINEE", "SCENARIO"), lambda label, extras: "Good Ending" in label),
+        "epithets": (("TRAINEE",), lambda label, extras: "epithet" in label),
+    },
+}
+
+# (game name, kind) -> a check for each field an entry needs past its roles, raising ValueError on a bad one
+EXTRA_FIELDS: Dict[Tuple[str, str], Tuple[Callable[[str], Any], ...]] = {
+    ("Umamusume: Pretty Derby", "races"): (_placement,),
+}
+
+
+def role_of(key: str) -> Optional[str]:
+    return next((role for role in ROLES if key.endswith(role)), None)
+
+
+def known_values(game_name: str) -> Dict[str, FrozenSet[str]]:
+    """
+    Returns every value each role can take in a game's templates, with every option on.
+    """
+
+    def build() -> Dict[str, FrozenSet[str]]:
+        game_cls: Type[Any] = game_classes()[game_name]
+        values: Dict[str, Set[str]] = dict()
+
+        for template in weight_table(make_game(game_cls, codex_options(game_cls))).templates:
+            for key, pool in zip(template.keys, template.pools):
+                values.setdefault(role_of(key) or key, set()).update(pool)
+
+        return {role: frozenset(names) for role, names in values.items()}
+
+    return _known.get(game_name, build)
+
+
+def progress_problems(progress: Dict[str, Dict[str, List[Entry]]]) -> List[Tuple[str, str]]:
+    """
+    Returns the entries naming something the game doesn't have, as (level, message) pairs like option_problems.
+    """
+
+    problems: List[Tuple[str, str]] = list()
+
+    for game_name, kinds in progress.items():
+        known: Dict[str, FrozenSet[str]] = known_values(game_name)
+
+        for kind, entries in kinds.items():
+            roles: Tuple[str, ...] = PROGRESS_KINDS[game_name][kind][0]
+
+            for entry in entries:
+                for role, value in zip(roles, entry):
+                    if value in known.get(role, frozenset()):
+                        continue
+
+                    level: str = "warning" if role in FREE_ROLES else "error"
+                    problems.append((level, f"{game_name} {kind} entry {list(entry)}: unknown {role.lower()} {value}"))
+
+    return problems
+
+
+def read_progress(path: Union[str, Path]) -> Dict[str, Dict[str, List[Entry]]]:
+    """
+    Reads a progress file. Raises ValueError if it names a game or kind that doesn't exist, an entry is malformed,
+    or an entry names a map, race or the like that the game doesn't have. Unknown trainees are left to
+    progress_problems.
+    """
+
+    with open(path, encoding="utf-8") as file:
+        progress: Any = json.load(file)
+
+    if not isinstance(progress, dict):
+        raise ValueError("Progress needs to be an object of games")
+
+    games: Dict[str, Dict[str, List[Entry]]] = dict()
+
+    for game_name, kinds in progress.items():
+        if game_name not in PROGRESS_KINDS:
+            raise ValueError(f"There is no progress to track for {game_name}")
+
+        if not isinstance(kinds, dict):
+            raise ValueError(f"The progress for {game_name} needs to be an object of kinds")
+
+        games[game_name] = dict()
+
+        for kind, entries in kinds.items():
+            if kind not in PROGRESS_KINDS[game_name]:
+                raise ValueError(f"{game_name} has no progress kind called {kind}")
+
+            roles: Tuple[str, ...] = PROGRESS_KINDS[game_name][kind][0]
+            extras: Tuple[Callable[[str], Any], ...] = EXTRA_FIELDS.get((game_name, kind), ())
+            games[game_name][kind] = list()
+
+            for entry in entries:
+                needed: int = len(roles) + len(extras)
+
+                if not isinstance(entry, list) or len(entry) < needed:
+                    raise ValueError(f"{game_name} {kind} entries need at least {needed} values: {entry}")
+
+                for check, value in zip(extras, entry[len(roles):]):
+                    try:
+                        check(str(value))
+                    except ValueError as error:
+                        raise ValueError(f"{game_name} {kind} entry {entry}: {error}") from error
+
+                games[game_name][kind].append(tuple(str(value) for value in entry))
+
+    errors: List[str] = [message for level, message in progress_problems(games) if level == "error"]
+
+    if errors:
+        raise ValueError("\n".join(errors))
+
+    return games
+
+
+def compile_progress(
+    game_name: str, templates: Sequence[CompiledTemplate], progress: Dict[str, List[Entry]], game: Any = None
+) -> List[int]:
+    """
+    Returns the bitmap of completed combinations for each template, in the order given.
+
+    Given the game, Bloons TD 6 medal sets that the completed maps already cover are included too.
+    """
+
+    masks: List[int] = [0] * len(templates)
+
+    if game is not None and game_name == "Bloons TD 6" and progress.get("maps"):
+        grid: MedalGrid = MedalGrid.for_game(game)
+
+        for map_name, mode, *_ in progress["maps"]:
+            grid.mark(map_name, mode)
+
+        masks = medal_set_exclusions(templates, grid)
+
+    for kind, entries in progress.items():
+        roles, completes = PROGRESS_KINDS[game_name][kind]
+
+        for template_index, template in enumerate(templates):
+            template_roles: List[Optional[str]] = [role_of(key) for key in template.keys]
+
+            if sorted(template_roles, key=str) != sorted(roles):
+                continue
+
+            # Which entry field fills each placeholder, in the template's own order
+            fields: List[int] = [roles.index(role) for role in template_roles]
+            lookups: List[Dict[str, int]] = [{value: i for i, value in enumerate(pool)} for pool in template.pools]
+
+            for entry in entries:
+                if not completes(template.label, entry[len(roles):]):
+                    continue
+
+                value_indices: List[Optional[int]] = [
+                    lookup.get(entry[field]) for lookup, field in zip(lookups, fields)
+                ]
+
+                if None not in value_indices:
+                    masks[template_index] |= 1 << template.index(value_indices)
+
+    return masks
@@ -0,0 +1,78 @@
+"""
+Streams spoiler and preview text for many slots to a file, one objective at a time.
+
+Each objective is written as soon as it's drawn (streams.iter_objectives), and they come from the shared
+ObjectiveTable, so the memory used doesn't grow with the size of a keep or of the multiworld. Output goes to any
+text file handle, including io.StringIO.
+
+    python -m tools.spoilers --slots 10000 --output spoiler.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from typing import Any, Iterable, List, Optional, TextIO, Tuple
+
+from . import interning
+from .implementations import load_implementations, make_game
+from .interning import ObjectiveTable
+from .streams import Seed, iter_objectives
+from .thread_generation import synthetic_slots
+
+# (player name, game, slot seed, objective count)
+SpoilerSlot = Tuple[str, Any, Seed, int]
+
+
+def write_spoiler(out: TextIO, slots: Iterable[SpoilerSlot], table: Optional[ObjectiveTable] = None) -> int:
+    """
+    Writes the objectives of every slot to out as they're generated, returning how many were written.
+    """
+
+    table = table or interning.objectives
+    written: int = 0
+
+    for player, game, seed, count in slots:
+        out.write(f"{player} ({game.name})\n")
+
+        for number, objective in enumerate(iter_objectives(game, seed, count, table=table), start=1):
+            out.write(f"  {number}. {objective}\n")
+            written += 1
+
+        out.write("\n")
+
+    return written
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--slots", type=int, default=1000)
+    parser.add_argument("--configurations", type=int, default=50, help="distinct option sets shared by the slots")
+    parser.add_argument("--count", type=int, default=40, help="objectives generated per slot")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default="-", help="file to write to, or - for stdout")
+
+    args = parser.parse_args(arguments)
+
+    load_implementations(offline=True)
+
+    # Slots are turned into games one at a time, as the spoiler reaches them
+    slots: Iterable[SpoilerSlot] = (
+        (f"Player {number}", make_game(game_cls, options), seed, count)
+        for number, (game_cls, options, seed, count) in enumerate(
+            synthetic_slots(args.slots, args.configurations, args.count, args.seed), start=1
+        )
+    )
+
+    if args.output == "-":
+        write_spoiler(sys.stdout, slots)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            write_spoiler(file, slots)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
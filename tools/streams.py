@@ -0,0 +1,310 @@
+"""
+Independent random streams for generating a slot's objectives, derived from the slot seed.
+
+Sharing one Random between every draw means the objectives a seed gives depend on the order things are drawn in.
+Here every stream is spawned from the seed and a key path instead (game name, template index, placeholder key),
+in the spirit of numpy's SeedSequence.spawn, so templates can be expanded in any order, lazily, or concurrently,
+and still give the same objectives.
+
+PlaceholderBags is an alternative to independent draws that spreads a keep evenly over each pool: values are dealt
+from a shuffled bag per placeholder key and pool, and no value comes round twice before the rest of its pool has.
+
+iter_objectives runs the whole pipeline one objective at a time: template pick, placeholder draws, the check
+against a bitmap of used combinations, then rendering. generate_objectives is a list of it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from random import Random
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .combinations import REROLL_ATTEMPTS, CompiledTemplate, free_combination
+from .dominance import DominanceLattice
+from .interning import ObjectiveTable
+from .weights import WeightTable, weight_table
+
+Seed = Union[int, str]
+
+
+def spawn_seed(seed: Seed, *keys: Hashable) -> int:
+    """
+    Derives a 128 bit child seed from a seed and a key path. Different key paths give unrelated seeds.
+    """
+
+    digest: bytes = hashlib.blake2b(repr((seed, *keys)).encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest, "little")
+
+
+def spawn_random(seed: Seed, *keys: Hashable) -> Random:
+    return Random(spawn_seed(seed, *keys))
+
+
+class ObjectiveStreams:
+    """
+    The random streams of one game in one slot.
+
+    Each placeholder of each template has its own stream, created the first time it's needed, so the n-th objective
+    drawn from a template is the same no matter what else was drawn before it.
+    """
+
+    def __init__(self, seed: Seed, game_name: str, table: Optional[ObjectiveTable] = None) -> None:
+        self.seed: Seed = seed
+        self.game_name: str = game_name
+        self.table: Optional[ObjectiveTable] = table
+
+        self._streams: Dict[Tuple[Hashable, ...], Random] = dict()
+
+    def stream(self, *keys: Hashable) -> Random:
+        random: Optional[Random] = self._streams.get(keys)
+
+        if random is None:
+            random = spawn_random(self.seed, self.game_name, *keys)
+            self._streams[keys] = random
+
+        return random
+
+    def template_stream(self) -> Random:
+        # Only used to choose which templates objectives come from
+        return self.stream("templates")
+
+    def placeholder_stream(self, template_index: int, key: str) -> Random:
+        return self.stream(template_index, key)
+
+    def render(self, template: CompiledTemplate, index: int) -> str:
+        return template.render(index) if self.table is None else self.table.render(template, index)
+
+    def draw(self, template: CompiledTemplate, template_index: int) -> int:
+        """
+        Draws the next combination index of a template from its placeholder streams.
+
+        Each stream picks an entry of the pool as the game lists it, so duplicated values keep their odds.
+        """
+
+        value_indices: List[int] = [
+            draws[self.placeholder_stream(template_index, key).randrange(len(draws))]
+            for key, draws in zip(template.keys, template.draws)
+        ]
+
+        return template.index(value_indices)
+
+
+class PlaceholderBags:
+    """
+    Shuffled-cycle draws for the placeholders of one game in one slot.
+
+    Every template drawing the same key from the same pool shares a bag, so Bloons' Beginner map templates between
+    them go through every Beginner map before repeating one. The shuffle of each cycle is spawned from the seed, so
+    the whole state of a bag is how many values have been dealt from it, and state() can be stored with the slot and
+    passed back in to carry on the same cycles later, e.g. for rerolls.
+    """
+
+    def __init__(self, seed: Seed, game_name: str, state: Optional[Dict[str, int]] = None) -> None:
+        self.seed: Seed = seed
+        self.game_name: str = game_name
+
+        self._dealt: Dict[str, int] = dict(state or dict())
+        self._orders: Dict[str, Tuple[int, Tuple[int, ...]]] = dict()
+
+    @staticmethod
+    def bag_name(key: str, pool: Sequence[str]) -> str:
+        digest: str = hashlib.blake2b("\0".join(pool).encode("utf-8"), digest_size=4).hexdigest()
+        return f"{key}:{digest}"
+
+    def _order(self, bag: str, size: int, cycle: int) -> Tuple[int, ...]:
+        current: Optional[Tuple[int, Tuple[int, ...]]] = self._orders.get(bag)
+
+        if current is None or current[0] != cycle:
+            order: List[int] = list(range(size))
+            spawn_random(self.seed, self.game_name, "bag", bag, cycle).shuffle(order)
+
+            current = (cycle, tuple(order))
+            self._orders[bag] = current
+
+        return current[1]
+
+    def deal(self, key: str, pool: Sequence[str], draws: Optional[Sequence[int]] = None) -> int:
+        """
+        Deals the next value index from the bag of a placeholder pool.
+
+        draws is the value index of each entry of the pool as the game lists it (see CompiledTemplate.draws), so a
+        duplicated value goes into the bag as many times as it's listed.
+        """
+
+        if draws is None:
+            draws = range(len(pool))
+
+        bag: str = self.bag_name(key, pool if len(draws) == len(pool) else [pool[i] for i in draws])
+        dealt: int = self._dealt.get(bag, 0)
+
+        cycle, position = divmod(dealt, len(draws))
+        self._dealt[bag] = dealt + 1
+
+        return draws[self._order(bag, len(draws), cycle)[position]]
+
+    def draw(self, template: CompiledTemplate) -> int:
+        return template.index(
+            [self.deal(key, pool, draws) for key, pool, draws in zip(template.keys, template.pools, template.draws)]
+        )
+
+    def draw_unused(self, template: CompiledTemplate, used: int, fallback: Random) -> Optional[int]:
+        """
+        Deals combinations until one isn't set in used, or None if the template has run out.
+
+        Templates with several placeholders can keep landing on used combinations once most are taken, so after a
+        few tries a free one is picked with the fallback stream instead.
+        """
+
+        if used.bit_count() >= template.count:
+            return None
+
+        for _ in range(REROLL_ATTEMPTS):
+            index: int = self.draw(template)
+
+            if not used >> index & 1:
+                return index
+
+        return free_combination(template.count, used, fallback)
+
+    def state(self) -> Dict[str, int]:
+        return dict(self._dealt)
+
+
+def generate_objectives(
+    game: Any,
+    seed: Seed,
+    count: int,
+    by_combinations: bool = False,
+    bags: Optional[PlaceholderBags] = None,
+    excluded: Optional[Sequence[int]] = None,
+    table: Optional[ObjectiveTable] = None,
+    lattice: Optional[DominanceLattice] = None,
+    include_difficult: bool = True,
+    include_time_consuming: bool = True,
+) -> List[str]:
+    """
+    Generates count objectives for a game from a slot seed, using a stream per template and placeholder.
+
+    Template choices use the game's weight table (see weights.weight_table). Each template's objectives are drawn
+    from its own streams, so the result is the same however the expansion work is ordered or split up.
+
+    If bags are given, placeholder values are dealt from them instead, in the order the templates were picked, and
+    the bags are left where the keep finished for later rerolls.
+
+    excluded holds a bitmap of combinations to leave out per template of the weight table (see progress.py).
+    Templates with nothing left are never picked.
+
+    With a table (see interning.py), objectives come from it, so slots share one copy of each.
+
+    With a lattice (see dominance.py), objectives that dominate or are dominated by one already drawn are never
+    drawn, e.g. "Get at least 3rd" in a race after "Win 1st" in it. It has to be built with the same
+    include_difficult and include_time_consuming, which leave templates out of the weight table like the host does.
+    """
+
+    return list(
+        iter_objectives(
+            game, seed, count, by_combinations, bags, excluded, table, lattice,
+            include_difficult=include_difficult, include_time_consuming=include_time_consuming,
+        )
+    )
+
+
+def iter_objectives(
+    game: Any,
+    seed: Seed,
+    count: Optional[int] = None,
+    by_combinations: bool = False,
+    bags: Optional[PlaceholderBags] = None,
+    excluded: Optional[Sequence[int]] = None,
+    table: Optional[ObjectiveTable] = None,
+    lattice: Optional[DominanceLattice] = None,
+    include_difficult: bool = True,
+    include_time_consuming: bool = True,
+) -> Iterator[str]:
+    """
+    Yields the objectives of generate_objectives one at a time, as each is drawn.
+
+    Only a bitmap of used combinations is kept per template, so memory stays flat however large the keep is.
+    Templates stop being picked once they've run out, and without a count it carries on until they all have, so a
+    keep holds min(count, what the templates can produce) objectives.
+
+    Raises ValueError if lattice wasn't built over the same templates and pools, in the same order.
+    """
+
+    streams: ObjectiveStreams = ObjectiveStreams(seed, game.name, table)
+    picker: Random = streams.template_stream()
+
+    weights: WeightTable = weight_table(game, include_difficult, include_time_consuming, by_combinations)
+    templates: Sequence[CompiledTemplate] = weights.templates
+
+    if lattice is not None and lattice.catalog != weights.catalog():
+        raise ValueError("The dominance lattice was built for different templates, see dominance_lattice")
+
+    used: List[int] = list(excluded or [0] * len(templates))
+    available: List[int] = [
+        template.count - _excluded_count(template, mask) for template, mask in zip(templates, used)
+    ]
+
+    exhausted: int = 0
+
+    for template_index, left in enumerate(available):
+        if left <= 0:
+            exhausted |= 1 << template_index
+
+    # Templates that run out stop being picked, so a keep only comes up short once every template has run out
+    skip: int = exhausted
+    cumulative: Tuple[int, ...] = weights.skipping(skip)
+    everything: int = (1 << len(templates)) - 1
+
+    drawn: int = 0
+
+    while count is None or drawn < count:
+        if exhausted == everything:
+            return
+
+        if skip != exhausted:
+            skip = exhausted
+            cumulative = weights.skipping(skip)
+
+        template_index: int = weights.choose(picker, cumulative=cumulative)[0]
+        template: CompiledTemplate = templates[template_index]
+
+        index: Optional[int]
+
+        if bags is not None:
+            fallback: Random = streams.placeholder_stream(template_index, "fallback")
+            index = bags.draw_unused(template, used[template_index], fallback)
+
+            if index is None:
+                continue
+        else:
+            index = streams.draw(template, template_index)
+
+            while used[template_index] >> index & 1:
+                index = streams.draw(template, template_index)
+
+        used[template_index] |= 1 << index
+        available[template_index] -= 1
+        drawn += 1
+
+        if not available[template_index]:
+            exhausted |= 1 << template_index
+
+        if lattice is not None:
+            # Related objectives count as used from here on, so drawing one is turned down like a repeat
+            for other_index, related in lattice.related(template_index, index):
+                blocked: int = related & ~used[other_index]
+
+                if blocked:
+                    used[other_index] |= blocked
+                    available[other_index] -= blocked.bit_count()
+
+                    if not available[other_index]:
+                        exhausted |= 1 << other_index
+
+        yield streams.render(template, index)
+
+
+def _excluded_count(template: CompiledTemplate, excluded: int) -> int:
+    return (excluded & ((1 << template.count) - 1)).bit_count()
@@ -0,0 +1,204 @@
+"""
+A large synthetic multiworld, to see how much these implementations add to the time and memory of a generation.
+
+Thousands of slots are created with random Bloons TD 6 and Umamusume options (trainee lists run to several hundred
+entries), and each generates a full keep through the reference path. Everything runs on the offline stand-ins,
+and every generated keep is kept alive until the end, like a real generation would.
+
+    python -m tools.stress_keeps --slots 10000 --max-rss-mib 512 --max-seconds 60 --max-slot-kib 256
+
+Each run is appended to a JSON lines trend file along with the game files' hashes, and compared with the previous
+run that used the same parameters. The exit code is 1 if a ceiling was broken.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from pathlib import Path
+from random import Random
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from .compare_generation import random_options, reference_objectives
+from .implementations import (
+    IMPLEMENTATIONS, REPOSITORY, game_classes, load_implementations, make_game, option_classes
+)
+from .manifest import source_hash
+
+TREND_PATH: Path = REPOSITORY / "stress_trend.jsonl"
+
+
+def _trainees(default: List[str], random: Random) -> List[str]:
+    # Real lists plus made up ones, so some slots have far more trainees than exist today
+    trainees: List[str] = random.sample(default, random.randint(1, len(default)))
+    trainees.extend(f"Synthetic Trainee {i}" for i in range(random.randint(0, 600)))
+
+    return trainees
+
+
+def slot_options(game_cls: Type[Any], random: Random) -> Dict[str, Any]:
+    options: Dict[str, Any] = random_options(game_cls, random)
+
+    for option_name, option_cls in option_classes(game_cls).items():
+        if option_name.endswith("trainees_owned"):
+            options[option_name] = _trainees(list(option_cls.default), random)
+
+    return options
+
+
+def peak_rss_kib() -> Optional[int]:
+    """
+    Returns the peak resident set size of this process, or None where the resource module doesn't exist (Windows).
+    """
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports KiB, macOS reports bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run(slots: int, seed: int, min_keep: int, max_keep: int, sample_every: int) -> Dict[str, Any]:
+    random: Random = Random(seed)
+    classes: List[Type[Any]] = list(game_classes().values())
+
+    keeps: List[List[str]] = list()
+    slot_peaks: List[int] = list()
+    skipped: int = 0
+
+    started: float = time.perf_counter()
+
+    for slot in range(slots):
+        game_cls: Type[Any] = random.choice(classes)
+        options: Dict[str, Any] = slot_options(game_cls, random)
+        keep_size: int = random.randint(min_keep, max_keep)
+        slot_seed: int = random.getrandbits(64)
+
+        sampled: bool = sample_every > 0 and slot % sample_every == 0
+
+        if sampled:
+            tracemalloc.start()
+
+        try:
+            game: Any = make_game(game_cls, options)
+
+            if any(level == "error" for level, _ in game.option_problems()):
+                skipped += 1
+                continue
+
+            keeps.append(reference_objectives(game, slot_seed, keep_size))
+        finally:
+            if sampled:
+                slot_peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+    elapsed: float = time.perf_counter() - started
+
+    return {
+        "slots": slots,
+        "generated": len(keeps),
+        "skipped": skipped,
+        "objectives": sum(len(keep) for keep in keeps),
+        "seconds": round(elapsed, 3),
+        "peak_rss_kib": peak_rss_kib(),
+        "max_slot_kib": round(max(slot_peaks, default=0) / 1024, 1),
+        "mean_slot_kib": round(sum(slot_peaks) / max(len(slot_peaks), 1) / 1024, 1),
+    }
+
+
+def _previous(trend_path: Path, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not trend_path.exists():
+        return None
+
+    previous: Optional[Dict[str, Any]] = None
+
+    with open(trend_path, encoding="utf-8") as file:
+        for line in file:
+            entry: Dict[str, Any] = json.loads(line)
+
+            if entry.get("parameters") == parameters:
+                previous = entry
+
+    return previous
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--slots", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-keep", type=int, default=20, help="fewest objectives a slot asks for")
+    parser.add_argument("--max-keep", type=int, default=120, help="most objectives a slot asks for")
+    parser.add_argument("--sample-every", type=int, default=100, help="trace the allocations of every Nth slot")
+    parser.add_argument("--max-rss-mib", type=float, default=None)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    parser.add_argument("--max-slot-kib", type=float, default=None)
+    parser.add_argument("--trend", type=Path, default=TREND_PATH, help="JSON lines file to append the run to")
+
+    args = parser.parse_args(arguments)
+
+    load_implementations(offline=True)
+
+    parameters: Dict[str, Any] = {
+        "slots": args.slots,
+        "seed": args.seed,
+        "keep": [args.min_keep, args.max_keep],
+        "sample_every": args.sample_every,
+    }
+
+    results: Dict[str, Any] = run(args.slots, args.seed, args.min_keep, args.max_keep, args.sample_every)
+
+    entry: Dict[str, Any] = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "sources": {module_name: source_hash(module_name)[:12] for module_name in IMPLEMENTATIONS},
+        "parameters": parameters,
+        "results": results,
+    }
+
+    previous: Optional[Dict[str, Any]] = _previous(args.trend, parameters)
+
+    with open(args.trend, "a", encoding="utf-8") as file:
+        file.write(json.dumps(entry) + "\n")
+
+    for key, value in results.items():
+        line: str = f"{key:>14}: {'n/a' if value is None else value}"
+
+        if previous is not None and isinstance(value, (int, float)) and previous["results"].get(key):
+            line += f"  ({(value - previous['results'][key]) / previous['results'][key]:+.1%} since {previous['time']})"
+
+        print(line)
+
+    peak_rss: Optional[int] = results["peak_rss_kib"]
+
+    if peak_rss is None and args.max_rss_mib is not None:
+        print("peak RSS is n/a on this platform, so its ceiling isn't checked", file=sys.stderr)
+
+    ceilings: List[Tuple[str, Optional[float], Optional[float]]] = [
+        ("peak RSS (MiB)", args.max_rss_mib, None if peak_rss is None else peak_rss / 1024),
+        ("wall time (s)", args.max_seconds, results["seconds"]),
+        ("per slot allocation (KiB)", args.max_slot_kib, results["max_slot_kib"]),
+    ]
+
+    broken: List[str] = [
+        f"{name} was {value:.1f}, over the ceiling of {ceiling}"
+        for name, ceiling, value in ceilings
+        if ceiling is not None and value is not None and value > ceiling
+    ]
+
+    for message in broken:
+        print(message, file=sys.stderr)
+
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
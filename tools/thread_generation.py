@@ -0,0 +1,122 @@
+"""
+Generates many slots on a thread pool, and measures how that scales with the number of threads.
+
+What slots share is immutable once built (catalog lists, compiled templates, weight tables), and the caches holding
+it are read without locking (see catalogs.DependencyCache). A slot's own state is only its game and its random
+streams, so nothing has to be pickled or re-imported in another process. On a free-threaded build (python3.13t) the
+threads run in parallel; with the GIL they give the same objectives, but take turns.
+
+    python -m tools.thread_generation --slots 2000 --threads 1 2 4 8
+
+Every thread count has to give the same objectives as generating the slots one by one, or the exit code is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from .compare_generation import feasible_cases
+from .implementations import game_classes, load_implementations, make_game
+from .streams import generate_objectives
+
+# (game class, raw option values, slot seed, objective count)
+Slot = Tuple[Type[Any], Dict[str, Any], int, int]
+
+
+def generate_slot(slot: Slot) -> List[str]:
+    game_cls, options, seed, count = slot
+    return generate_objectives(make_game(game_cls, options), seed, count)
+
+
+def generate_slots(slots: Sequence[Slot], threads: int) -> List[List[str]]:
+    """
+    Generates every slot, on a pool of the given number of threads. Results are in the same order as the slots.
+    """
+
+    if threads <= 1:
+        return [generate_slot(slot) for slot in slots]
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="keep") as executor:
+        return list(executor.map(generate_slot, slots))
+
+
+def synthetic_slots(slots: int, configurations: int, count: int, seed: int) -> List[Slot]:
+    # Slots reuse a limited number of option sets, the way many players keep the defaults or share a YAML
+    random: Random = Random(seed)
+    options: List[Tuple[Type[Any], Dict[str, Any]]] = list()
+
+    for game_name, game_cls in game_classes().items():
+        cases = feasible_cases(game_cls, max(configurations // len(game_classes()), 1), Random(f"{seed}{game_name}"))
+        options.extend((game_cls, values) for values, _ in cases)
+
+    return [(*random.choice(options), random.getrandbits(64), count) for _ in range(slots)]
+
+
+def gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def benchmark(slots: Sequence[Slot], thread_counts: Sequence[int], repeats: int) -> Tuple[List[Tuple[int, float]], bool]:
+    """
+    Times generate_slots at each thread count, taking the best of repeats, and checks each against one thread.
+    """
+
+    # Warm the shared caches first, so every thread count is timed against the same steady state
+    expected: List[List[str]] = generate_slots(slots, 1)
+
+    timings: List[Tuple[int, float]] = list()
+    matched: bool = True
+
+    for threads in thread_counts:
+        best: float = float("inf")
+
+        for _ in range(repeats):
+            started: float = time.perf_counter()
+            results: List[List[str]] = generate_slots(slots, threads)
+            best = min(best, time.perf_counter() - started)
+
+            matched = matched and results == expected
+
+        timings.append((threads, best))
+
+    return timings, matched
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--slots", type=int, default=2000)
+    parser.add_argument("--configurations", type=int, default=50, help="distinct option sets shared by the slots")
+    parser.add_argument("--count", type=int, default=40, help="objectives generated per slot")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeats", type=int, default=3, help="runs per thread count, the fastest is shown")
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(arguments)
+
+    load_implementations(offline=True)
+
+    slots: List[Slot] = synthetic_slots(args.slots, args.configurations, args.count, args.seed)
+    timings, matched = benchmark(slots, args.threads, args.repeats)
+
+    print(f"{len(slots)} slots, GIL {'enabled' if gil_enabled() else 'disabled'}")
+
+    baseline: float = timings[0][1]
+
+    for threads, seconds in timings:
+        print(f"{threads:>3} threads  {seconds:.3f} s  {len(slots) / seconds:>9.0f} slots/s  {baseline / seconds:.2f}x")
+
+    if not matched:
+        print("Threaded generation gave different objectives than generating one slot at a time", file=sys.stderr)
+
+    return 0 if matched else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
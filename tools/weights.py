@@ -0,0 +1,108 @@
+"""
+Cumulative weight tables for choosing objective templates.
+
+A table is compiled once per option fingerprint and filter, and each pick is then a bisect over its cumulative
+weights (random.choices with cum_weights), instead of a pass over every template's weight.
+
+Every template in these implementations has weight=1, which makes a template with 6 bosses x 5 tiers x 13 maps as
+likely as one with 5 URA Finale races. Tables can optionally scale each weight by the template's combination count,
+so objectives are picked evenly across everything the options allow instead.
+"""
+
+from __future__ import annotations
+
+from itertools import accumulate
+from random import Random
+from typing import Any, Hashable, List, Optional, Tuple
+
+from .catalogs import DependencyCache
+from .combinations import CompiledTemplate, catalog_hash
+from .implementations import options_fingerprint
+
+# How many compiled tables are kept, least recently used going first
+MAX_TABLES: int = 256
+
+# Tables are dropped when a catalog overlay changes a catalog their templates drew from
+_tables: DependencyCache = DependencyCache(MAX_TABLES)
+
+
+class WeightTable:
+    __slots__ = ("templates", "cumulative", "total", "_catalog")
+
+    def __init__(self, templates: List[CompiledTemplate], by_combinations: bool = False) -> None:
+        self.templates: Tuple[CompiledTemplate, ...] = tuple(templates)
+
+        weights: List[int] = [
+            template.template.weight * (template.count if by_combinations else 1) for template in self.templates
+        ]
+
+        self.cumulative: Tuple[int, ...] = tuple(accumulate(weights))
+        self.total: int = self.cumulative[-1] if self.cumulative else 0
+        self._catalog: Optional[bytes] = None
+
+    def catalog(self) -> bytes:
+        """
+        Returns the catalog_hash of the templates, worked out the first time it's asked for.
+        """
+
+        if self._catalog is None:
+            self._catalog = catalog_hash(self.templates)
+
+        return self._catalog
+
+    def skipping(self, skip: int = 0) -> Tuple[int, ...]:
+        """
+        Returns the cumulative weights with the templates whose bit is set in skip weighted 0.
+        """
+
+        if not skip:
+            return self.cumulative
+
+        weights: List[int] = [
+            0 if skip >> i & 1 else weight
+            for i, weight in enumerate(b - a for a, b in zip((0,) + self.cumulative, self.cumulative))
+        ]
+
+        return tuple(accumulate(weights))
+
+    def choose(
+        self, random: Random, k: int = 1, skip: int = 0, cumulative: Optional[Tuple[int, ...]] = None
+    ) -> List[int]:
+        """
+        Picks k template indices, with replacement. Templates whose bit is set in skip are never picked.
+
+        Callers picking one at a time can pass the cumulative weights of skipping(skip), to only work them out once.
+        """
+
+        cumulative = cumulative or self.skipping(skip)
+
+        if not cumulative or not cumulative[-1]:
+            raise ValueError("None of the templates can be picked")
+
+        return random.choices(range(len(self.templates)), cum_weights=cumulative, k=k)
+
+
+def weight_table(
+    game: Any,
+    include_difficult: bool = True,
+    include_time_consuming: bool = True,
+    by_combinations: bool = False,
+) -> WeightTable:
+    """
+    Returns the compiled weight table for a game's templates, building it the first time its options are seen.
+
+    Difficult and time consuming templates are left out when they aren't included, like the host does.
+    """
+
+    def build() -> WeightTable:
+        templates: List[CompiledTemplate] = [
+            CompiledTemplate(template)
+            for template in game.game_objective_templates()
+            if (include_difficult or not template.is_difficult)
+            and (include_time_consuming or not template.is_time_consuming)
+        ]
+
+        return WeightTable(templates, by_combinations)
+
+    key: Hashable = (options_fingerprint(game), include_difficult, include_time_consuming, by_combinations)
+    return _tables.get(key, build)
@@ -14,7 +14,7 @@ Depending on YAML Options, the following objective types can be included:
 from __future__ import annotations
 
 import functools
-from typing import List, Dict, Set
+from typing import Callable, List, Dict, FrozenSet, Optional, Set, Tuple
 
 from dataclasses import dataclass
 
@@ -35,6 +35,108 @@ class UmamusumePrettyDerbyArchipelagoOptions:
     umamusume_pretty_derby_include_ura_finale: UmamusumePrettyDerbyIncludeURAFinale
     umamusume_pretty_derby_include_unity_cup: UmamusumePrettyDerbyIncludeUnityCup
 
+# Every list the objectives draw from, by name. Each one is built the first time it's asked for and reused after that.
+catalogs: Dict[str, Callable[[], List[str]]] = dict()
+
+# Lists to use instead of the ones written here, by catalog name.
+# Hosts that run for a long time can swap this out to pick up new maps or races without restarting.
+catalog_overrides: Dict[str, List[str]] = dict()
+
+def catalog(function: Callable[[], List[str]]) -> Callable[[], List[str]]:
+    cached: Callable[[], List[str]] = functools.lru_cache(maxsize=None)(function)
+
+    @functools.wraps(function)
+    def lookup() -> List[str]:
+        override: Optional[List[str]] = catalog_overrides.get(function.__name__)
+        return cached() if override is None else override
+
+    catalogs[function.__name__] = lookup
+    return lookup
+
+# One objective a slot can be given. Placeholders name the method of the game that gives their values,
+# and the objective is only offered when every option in requires is on.
+@dataclass(frozen=True)
+class UmamusumePrettyDerbyObjective:
+    label: str
+    placeholders: Tuple[Tuple[str, str], ...] = ()
+    requires: Tuple[str, ...] = ()
+    is_time_consuming: bool = False
+    is_difficult: bool = False
+    weight: int = 1
+
+placements: Tuple[str, ...] = (
+    "Win 1st",
+    "Get at least 2nd",
+    "Get at least 3rd",
+    "Get at least 4th",
+    "Get at least 5th",
+)
+
+# (outcome, opponent team, is_difficult) for each preliminary round of the Unity Cup
+unity_cup_matches: Tuple[Tuple[str, str, bool], ...] = (
+    ("Win", "strongest", True),
+    ("Win or Draw", "strongest", False),
+    ("Win", "middle", False),
+    ("Win or Draw", "middle", False),
+    ("Win", "weakest", False),
+    ("Win or Draw", "weakest", False),
+)
+
+# Every objective, in the order they're offered
+objective_grid: Tuple[UmamusumePrettyDerbyObjective, ...] = (
+    *(
+        UmamusumePrettyDerbyObjective(f"{placement} in RACE within Career Mode", (("RACE", "races"),))
+        for placement in placements
+    ),
+    UmamusumePrettyDerbyObjective(
+        "Win 1st in RACE within Career Mode",
+        (("RACE", "races_ura_finale"),),
+        ("include_ura_finale",),
+        is_difficult=True,
+    ),
+    *(
+        UmamusumePrettyDerbyObjective(
+            f"{outcome} against the {team} team available in ROUND",
+            (("ROUND", "rounds_unity_cup"),),
+            ("include_unity_cup",),
+            is_difficult=is_difficult,
+        )
+        for outcome, team, is_difficult in unity_cup_matches
+    ),
+    UmamusumePrettyDerbyObjective(
+        "Win against Team Zenith at the end of the Unity Cup.",
+        requires=("include_unity_cup",),
+        is_difficult=True,
+    ),
+    UmamusumePrettyDerbyObjective(
+        "Win against Little Cocon or Bitter Glasse in the URA Finale",
+        requires=("include_unity_cup", "include_ura_finale"),
+        is_time_consuming=True,
+        is_difficult=True,
+    ),
+    UmamusumePrettyDerbyObjective(
+        "Get the Good Ending in the SCENARIO scenario with TRAINEE",
+        (("SCENARIO", "scenarios"), ("TRAINEE", "trainees")),
+        ("include_trainee_challenges",),
+    ),
+    UmamusumePrettyDerbyObjective(
+        "Get the unique epithet for TRAINEE",
+        (("TRAINEE", "trainees"),),
+        ("include_trainee_challenges",),
+        is_time_consuming=True,
+        is_difficult=True,
+    ),
+)
+
+# The options that decide which objectives are offered
+objective_grid_options: Tuple[str, ...] = tuple(
+    sorted({option for objective in objective_grid for option in objective.requires})
+)
+
+@functools.lru_cache(maxsize=None)
+def objectives_for(included: FrozenSet[str]) -> Tuple[UmamusumePrettyDerbyObjective, ...]:
+    return tuple(objective for objective in objective_grid if included.issuperset(objective.requires))
+
 class UmamusumePrettyDerbyGame(Game):
     """
     Umamusume: Pretty Derby is a Sports Simulation and Raising Simulation game, where you train horsegirls known as Umamusume to win races against other Umamusume.
@@ -82,174 +184,61 @@ class UmamusumePrettyDerbyGame(Game):
         
         return objectives
 
-    def game_objective_templates(self) -> List[GameObjectiveTemplate]:
-        objectives: List[GameObjectiveTemplate] = [
-            GameObjectiveTemplate(
-                label="Win 1st in RACE within Career Mode",
-                data={
-                    "RACE": (self.races, 1),
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=1,
-            ),
-            GameObjectiveTemplate(
-                label="Get at least 2nd in RACE within Career Mode",
-                data={
-                    "RACE": (self.races, 1),
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=1,
-            ),
-            GameObjectiveTemplate(
-                label="Get at least 3rd in RACE within Career Mode",
-                data={
-                    "RACE": (self.races, 1),
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=1,
-            ),
-            GameObjectiveTemplate(
-                label="Get at least 4th in RACE within Career Mode",
-                data={
-                    "RACE": (self.races, 1),
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=1,
-            ),
-            GameObjectiveTemplate(
-                label="Get at least 5th in RACE within Career Mode",
-                data={
-                    "RACE": (self.races, 1),
-                },
-                is_time_consuming=False,
-                is_difficult=False,
-                weight=1,
-            ),
+    # Objectives that can't be done under an optional constraint, as (constraint, objective label, placeholder values).
+    # No objective label means any objective, and None for the values of a placeholder means any of its values.
+    def constraint_conflicts(self) -> List[Tuple[str, Optional[str], Dict[str, Optional[List[str]]]]]:
+        return [
+            # Normally kept apart by include_trainee_constraints already
+            ("Use TRAINEE to complete these goals, if that is possible", None, {"TRAINEE": None}),
+            ("Complete these goals whilst only training STAT, if that is possible", "Get the unique epithet for TRAINEE", {}),
         ]
-        
-        if self.include_ura_finale:
-            objectives.append(
-                GameObjectiveTemplate(
-                    label="Win 1st in RACE within Career Mode",
-                    data={
-                        "RACE": (self.races_ura_finale,1),
-                    },
-                    is_time_consuming=False,
-                    is_difficult=True,
-                    weight=1,
-                )
-            )
-        
-        if self.include_unity_cup:
-            objectives.extend([
-                GameObjectiveTemplate(
-                    label="Win against the strongest team available in ROUND",
-                    data={
-                        "ROUND": (self.rounds_unity_cup,1),
-                    },
-                    is_time_consuming=False,
-                    is_difficult=True,
-                    weight=1,
-                ),
-                GameObjectiveTemplate(
-                    label="Win or Draw against the strongest team available in ROUND",
-                    data={
-                        "ROUND": (self.rounds_unity_cup,1),
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=1,
-                ),
-                GameObjectiveTemplate(
-                    label="Win against the middle team available in ROUND",
-                    data={
-                        "ROUND": (self.rounds_unity_cup,1),
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=1,
-                ),
-                GameObjectiveTemplate(
-                    label="Win or Draw against the middle team available in ROUND",
-                    data={
-                        "ROUND": (self.rounds_unity_cup,1),
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=1,
-                ),
-                GameObjectiveTemplate(
-                    label="Win against the weakest team available in ROUND",
-                    data={
-                        "ROUND": (self.rounds_unity_cup,1),
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=1,
-                ),
-                GameObjectiveTemplate(
-                    label="Win or Draw against the weakest team available in ROUND",
-                    data={
-                        "ROUND": (self.rounds_unity_cup,1),
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=1,
-                ),
+
+    def game_objective_templates(self) -> List[GameObjectiveTemplate]:
+        included: FrozenSet[str] = frozenset(option for option in objective_grid_options if getattr(self, option))
+        cached: Optional[Tuple[FrozenSet[str], List[GameObjectiveTemplate]]] = self.__dict__.get("_objective_templates")
+
+        # Built once per instance, and again only if the options it was built from have changed
+        if cached is None or cached[0] != included:
+            templates: List[GameObjectiveTemplate] = [
                 GameObjectiveTemplate(
-                    label="Win against Team Zenith at the end of the Unity Cup.",
+                    label=objective.label,
                     data={
+                        key: (getattr(self, method), 1) for key, method in objective.placeholders
                     },
-                    is_time_consuming=False,
-                    is_difficult=True,
-                    weight=1,
-                ),
-            ])
-            
-            if self.include_ura_finale:
-                objectives.append(
-                    GameObjectiveTemplate(
-                        label="Win against Little Cocon or Bitter Glasse in the URA Finale",
-                        data={
-                        },
-                        is_time_consuming=True,
-                        is_difficult=True,
-                        weight=1,
-                    )
+                    is_time_consuming=objective.is_time_consuming,
+                    is_difficult=objective.is_difficult,
+                    weight=objective.weight,
                 )
-        
-        if self.include_trainee_challenges:
-            objectives.extend([
-                GameObjectiveTemplate(
-                    label="Get the Good Ending in the SCENARIO scenario with TRAINEE",
-                    data={
-                        "SCENARIO": (self.scenarios,1),
-                        "TRAINEE": (self.trainees,1),
-                    },
-                    is_time_consuming=False,
-                    is_difficult=False,
-                    weight=1,
-                ),
-                GameObjectiveTemplate(
-                    label="Get the unique epithet for TRAINEE",
-                    data={
-                        "SCENARIO": (self.scenarios,1),
-                        "TRAINEE": (self.trainees,1),
-                    },
-                    is_time_consuming=True,
-                    is_difficult=True,
-                    weight=1,
-                ),
-            ])
-        
-        return objectives
+                for objective in objectives_for(included)
+            ]
+
+            cached = (included, templates)
+            self._objective_templates = cached
+
+        return list(cached[1])
 
-    @functools.cached_property
-    def races_base(self) -> List[str]:
+    # Problems with the chosen options that would stop objectives from generating, as (level, message) pairs
+    def option_problems(self) -> List[Tuple[str, str]]:
+        problems: List[Tuple[str, str]] = list()
+        trainees: List[str] = self.trainees()
+
+        if not trainees:
+            if self.include_trainee_challenges:
+                problems.append(("error", "Trainee challenges are on, but no trainees are owned."))
+            else:
+                problems.append(("error", "The trainee constraint needs at least one owned trainee to pick from."))
+
+        # Any text is allowed here, so these are only warnings; they're usually typos or Umas newer than this version
+        unknown: List[str] = sorted(set(trainees) - set(UmamusumePrettyDerbyTraineesOwned.default))
+
+        if unknown:
+            problems.append(("warning", f"Trainees not in the default trainee list: {', '.join(unknown)}"))
+
+        return problems
+
+    @staticmethod
+    @catalog
+    def races_base() -> List[str]:
         return [
             "Junior Make Debut",
         ]
@@ -258,8 +247,9 @@ class UmamusumePrettyDerbyGame(Game):
     def include_g1(self) -> bool:
         return bool(self.archipelago_options.umamusume_pretty_derby_include_g1.value)
 
-    @functools.cached_property
-    def races_g1(self) -> List[str]:
+    @staticmethod
+    @catalog
+    def races_g1() -> List[str]:
         return [
             "Asahi Hai Futurity Stakes",
             "Hanshin Juvenile Fillies",
@@ -283,7 +273,7 @@ class UmamusumePrettyDerbyGame(Game):
             "Arima Kinen",
             "Tokyo Daishoten",
 
-            "Februrary Stakes",
+            "February Stakes",
             "Tenno Sho (Spring)",
             "Victoria Mile",
             "Teio Sho",
@@ -294,8 +284,9 @@ class UmamusumePrettyDerbyGame(Game):
     def include_g2(self) -> bool:
         return bool(self.archipelago_options.umamusume_pretty_derby_include_g2.value)
 
-    @functools.cached_property
-    def races_g2(self) -> List[str]:
+    @staticmethod
+    @catalog
+    def races_g2() -> List[str]:
         return [
             "Daily Hai Junior Stakes",
             "Keio Hai Junior Stakes",
@@ -336,8 +327,9 @@ class UmamusumePrettyDerbyGame(Game):
     def include_g3(self) -> bool:
         return bool(self.archipelago_options.umamusume_pretty_derby_include_g3.value)
 
-    @functools.cached_property
-    def races_g3(self) -> List[str]:
+    @staticmethod
+    @catalog
+    def races_g3() -> List[str]:
         return [
             "Hakodate Junior Stakes",
             "Niigata Junior Stakes",
@@ -412,8 +404,9 @@ class UmamusumePrettyDerbyGame(Game):
     def include_ura_finale(self) -> bool:
         return bool(self.archipelago_options.umamusume_pretty_derby_include_ura_finale.value)
 
-    @functools.cached_property
-    def races_ura_finale(self) -> List[str]:
+    @staticmethod
+    @catalog
+    def races_ura_finale() -> List[str]:
         return [
             "Ura Finals Final (Dirt)",
             "Ura Finals Final (Sprint)",
@@ -423,19 +416,19 @@ class UmamusumePrettyDerbyGame(Game):
         ]
 
     def races(self) -> List[str]:
-        races: List[str] = self.races_base[:]
+        races: List[str] = self.races_base()[:]
 
         # Check if G1 races are included, and include them if so
         if self.include_g1:
-            races.extend(self.races_g1[:])
+            races.extend(self.races_g1())
 
         # Check if G2 races are included, and include them if so
         if self.include_g2:
-            races.extend(self.races_g2[:])
+            races.extend(self.races_g2())
 
         # Check if G3 races are included, and include them if so
         if self.include_g3:
-            races.extend(self.races_g3[:])
+            races.extend(self.races_g3())
 
         return races
     
@@ -444,6 +437,7 @@ class UmamusumePrettyDerbyGame(Game):
         return bool(self.archipelago_options.umamusume_pretty_derby_include_unity_cup.value)
     
     @staticmethod
+    @catalog
     def rounds_unity_cup() -> List[str]:
         return [
             "Unity Cup Round 1 (December Junior Year)",
@@ -453,6 +447,7 @@ class UmamusumePrettyDerbyGame(Game):
         ]
 
     @staticmethod
+    @catalog
     def stats() -> List[str]:
         return [
             "Speed",
@@ -479,6 +474,7 @@ class UmamusumePrettyDerbyGame(Game):
             return True
     
     @staticmethod
+    @catalog
     def scenarios() -> List[str]:
         return [
             "URA Finale",